@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+
+class Filter_config:
+    """Configuration for Filter."""
+
+    # How regex_list and suspicious_regex built from Words_DB.blacklists.abc are matched:
+    # "classes" - patterns with character classes against the text, as they are in Words_DB;
+    # "skeleton" - text is folded to Cyrillic skeleton and matched with folded patterns;
+    # "verify" - both ways, differences are logged, "classes" verdict is used.
+    # "tokens" - text is split to tokens once, rules which can't match across tokens are matched
+    # per unique token with results remembered for next messages, other rules as in "skeleton".
+    match_mode: str = "skeleton"
+
+    # Filter.check_many: max count of remembered verdicts of the batch
+    # and count of messages to check before letting other tasks run.
+    batch_memo_size: int = 10000
+    batch_yield_every: int = 100
+
+    # Filter.filter_response verdict cache: max count of verdicts and seconds a verdict lives.
+    # Size 0 switches the cache off. Verdicts are dropped when Words_DB lists change.
+    verdict_cache_size: int = 10000
+    verdict_cache_ttl: float = 600.0
+
+    # Mass mailing: message is suspicious, and moderators are notified, when near copies of it come
+    # from this count of users within the window (seconds). It is not removed: members may ask
+    # the same question. 0 switches the check off. The index keeps not more than
+    # near_duplicate_index_size messages. Near copies share at least near_duplicate_similarity
+    # of MinHash signature. Texts shorter than near_duplicate_min_length letters are skipped.
+    near_duplicate_senders: int = 5
+    near_duplicate_window: float = 600.0
+    near_duplicate_index_size: int = 50000
+    near_duplicate_similarity: float = 0.6
+    near_duplicate_min_length: int = 30
+
+    # Order of Filter.check_text stages:
+    # "cost" - cheap checks first, the check stops as soon as the message is to be removed;
+    # "compat" - the order check_text has always used. Same verdicts, but the reason of
+    # removal may differ from "cost" order when several checks would remove the message.
+    pipeline_order: str = "cost"
+
+    # Suspicious verdicts of messages in Latin, with phone or bank card numbers, like bots send.
+    # check_text has never returned them, so they are off: most of them are ordinary messages.
+    bot_heuristics: bool = False
+
+    # Count of worker processes Filter checks run in, so long messages don't stop the bot.
+    # 0 - checks run on the event loop.
+    executor_workers: int = 0
+
+    # "tokens" match mode: max count of tokens every list remembers results for.
+    token_memo_size: int = 65536
+
+    # Seconds between checks of config/words_db.py. Changed lists are compiled in background
+    # and used for new messages without restart. 0 - lists are read on start only.
+    reload_interval: float = 5.0
+
+    # Per rule counters of executions, matches, whitelisted words and time, see Filter.rule_stats_snapshot.
+    # Every rule_stats_interval seconds they are saved to rule_stats_path and dropped. 0 - never saved.
+    # Checks running in worker processes are not counted.
+    rule_stats: bool = True
+    rule_stats_interval: float = 3600.0
+    rule_stats_path: str = "/home/mark/moderator_bot/logs/rule_stats.json"
+
+    # How suspicious words are counted against Words_DB.blacklists.suspicious_points_limit:
+    # "count" - every found word and the sender not being a member are one point;
+    # "weighted" - points are weights of the rules which found the words, see filter/scoring.py.
+    # Weights are tuned offline and saved to suspicious_weights_path. Empty path - every weight is 1.0.
+    suspicious_scoring: str = "count"
+    suspicious_weights_path: str = ""
@@ -7,3 +7,12 @@ class Logs:
     longpoll_log: str = "/home/mark/moderator_bot/logs/longpoll.log"
     filter_log: str = "/home/mark/moderator_bot/logs/filter.log"
     processing_log: str = "/home/mark/moderator_bot/logs/processing.log"
+
+    # Debug tracing of subsystems, it works in debug mode (-d) only.
+    # Switched off subsystem doesn't even format its debug messages.
+    trace_filter: bool = True
+    trace_vk_processing: bool = True
+    trace_vk_api: bool = True
+    trace_longpoll: bool = True
+    trace_tlg_processing: bool = True
+    trace_tlg_db: bool = True
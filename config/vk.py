@@ -12,6 +12,15 @@ class VK_config:
         errors_limit: int = 3
         wait_period: int = 10
 
+    # Longpoll updates are fetched by one task and processed by others, see vk.processing.pipeline
+    class Pipeline:
+        # Updates waiting for processing. Fetching waits while the queue is full
+        queue_size: int = 1000
+        # Tasks processing updates concurrently
+        consumers: int = 8
+        # Seconds between pipeline metrics in the log, 0 to switch them off
+        metrics_interval: float = 300.0
+
     class API:
         api_key: str = (
             "VK_API_KEY"
@@ -21,11 +30,34 @@ class VK_config:
         delete_for_all: int = 1
         version: str = "5.199"
 
+    # Shared HTTP connection pool of all VK API requests, see vk.api.get_session
+    class HTTP:
+        # Seconds for the whole request, from connecting to reading the response
+        total_timeout: float = 15.0
+        # Seconds to get a connection from the pool and to connect
+        connect_timeout: float = 5.0
+        # Seconds added to Longpoll.wait for longpoll requests, VK answers them after wait seconds
+        longpoll_timeout_margin: float = 10.0
+        # Connections of the pool: all and to one host
+        limit: int = 20
+        limit_per_host: int = 10
+        # Seconds to keep idle connection open for the next request
+        keepalive_timeout: float = 60.0
+        # Seconds to keep resolved DNS names
+        dns_cache_ttl: int = 300
+
     chats: dict[str, str] = {
         "2000000001": "Main chat",
     }
     log_path: str = "/var/log/moderator_bot/vk_moderator.log"
     service_name: str = "vk_moderator"
+    # Seconds to wait before the second check of a chat message, bad bots edit messages meanwhile
     check_delay: int = 10
+    # Second checks waiting and running, new messages are not rechecked over the limit
+    recheck_limit: int = 5000
+    # Second checks of one chat within this many seconds are done by one messages search
+    recheck_window: float = 2.0
+    # Chats rechecked at once
+    recheck_concurrency: int = 4
     messages_search_count: int = 3
     public_name = "Самый лучший паблик"
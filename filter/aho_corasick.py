@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable
+
+
+class AhoCorasick:
+    """
+    Multi-pattern automaton for literal substring search.
+    All patterns are found in one linear pass over the text, whatever the size of the list.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        """
+        Build the automaton.
+
+        :type patterns: ``Iterable[str]``
+        :param patterns: Literal patterns. Pattern index is its position in this iterable.
+        """
+
+        self.patterns: tuple[str, ...] = tuple(patterns)
+        # State 0 is the root. Every state has transitions, failure link and output.
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.output: list[tuple[int, ...]] = [()]
+
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = next_state
+            self.output[state] += (index,)
+
+        # Breadth-first pass to set failure links and merge outputs of suffix states
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] += self.output[self.fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterable[tuple[int, int]]:
+        """
+        Find every pattern occurrence in the text.
+
+        :type text: ``str``
+        :param text: Text to search in.
+
+        :return: Yields pairs of end position and pattern index.
+        :rtype: ``Iterable[tuple[int, int]]``
+        """
+
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                yield position, index
+
+    def first_match(self, text: str) -> str | None:
+        """
+        Find the pattern which comes first in the patterns list among all found in the text.
+        This is the pattern the old item-by-item loop would have reported.
+
+        :type text: ``str``
+        :param text: Text to search in.
+
+        :return: Returns the pattern or None if nothing was found.
+        :rtype: ``str | None``
+        """
+
+        found = None
+        for _, index in self.iter_matches(text):
+            if index == 0:
+                return self.patterns[0]
+            if found is None or index < found:
+                found = index
+        if found is None:
+            return None
+        return self.patterns[found]
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+from config.filter import Filter_config
+from filter.main import Filter
+from filter.normalization import NormalizedText
+
+# Bump when the corpus generator changes, so results of different corpora are never compared
+CORPUS_VERSION = 1
+CORPUS_SEED = 2026
+
+CLEAN_WORDS = (
+    "привет", "всем", "как", "дела", "сегодня", "завтра", "собрание", "во", "дворе", "в", "семь", "вечера",
+    "кто", "видел", "кошку", "рыжую", "потерялась", "возле", "магазина", "спасибо", "за", "помощь",
+    "отключат", "воду", "горячую", "на", "неделю", "лифт", "опять", "не", "работает", "подъезд", "мусор",
+    "детская", "площадка", "парковка", "соседи", "шумят", "ночью", "праздник", "поздравляю", "погода",
+    "дождь", "снег", "автобус", "маршрут", "школа", "садик", "ремонт", "дороги", "мудрость", "корабль",
+    "рубль", "перпендикулярно", "ибо", "блямба", "ёлки", "зелёные", "hello", "ok", "2026", "15:30",
+)
+CURSE_WORDS = (
+    "бля", "блядь", "сука", "пиздец", "ебать", "хуйня", "мудак", "долбоеб", "заебал", "чмо",
+    "конченый", "рашка", "укры", "залупа", "охуеть",
+)
+SPAM_PHRASES = (
+    "пиши в личку", "заходи на t.me/earnings", "смотри bit.ly/x7f2", "вакансия курьера, доход от 100000₽",
+    "удаленная работа, бонус каждый день", "в тг: @seller_bot", "промокод на скидку", "оплата картой",
+    "кэшбэк до 50%", "vk.cc/a1b2c3", "заработок в интернете без вложений", "звони 8 999 123 45 67",
+)
+# Look-alike characters spammers put instead of Cyrillic letters
+HOMOGLYPHS = {
+    "а": "a@4", "в": "b8", "е": "e3", "з": "3", "и": "u", "к": "k", "м": "m", "н": "h", "о": "o0",
+    "р": "p", "с": "c", "т": "t", "у": "y", "х": "x", "б": "6",
+}
+# VK message length limit
+LONG_MESSAGE_LENGTH = 4096
+
+
+def build_corpus(seed: int = CORPUS_SEED, size: int = 1000) -> list[tuple[str, str]]:
+    """
+    Build the benchmark corpus. The same seed and CORPUS_VERSION give the same corpus.
+
+    Messages are clean, with curses, spam, homoglyph-obfuscated curses and spam, and very long ones,
+    in the proportions of a busy public chat.
+
+    :type seed: ``int``
+    :param seed: Random seed.
+
+    :type size: ``int``
+    :param size: Count of messages.
+
+    :return: Returns category and text of every message.
+    :rtype: ``list[tuple[str, str]]``
+    """
+
+    rnd = random.Random(seed)
+
+    def clean(words: int) -> str:
+        return " ".join(rnd.choice(CLEAN_WORDS) for _ in range(words))
+
+    def obfuscate(text: str) -> str:
+        return "".join(
+            rnd.choice(HOMOGLYPHS[char]) if char in HOMOGLYPHS and rnd.random() < 0.5 else char
+            for char in text
+        )
+
+    makers: dict[str, Callable[[], str]] = {
+        "clean": lambda: clean(rnd.randint(1, 30)),
+        "curse": lambda: f"{clean(rnd.randint(0, 10))} {rnd.choice(CURSE_WORDS)} {clean(rnd.randint(0, 10))}",
+        "spam": lambda: f"{clean(rnd.randint(0, 8))} {rnd.choice(SPAM_PHRASES)} {clean(rnd.randint(0, 8))}",
+        "homoglyph": lambda: obfuscate(rnd.choice(CURSE_WORDS + SPAM_PHRASES) + " " + clean(rnd.randint(0, 6))),
+        "long": lambda: clean(LONG_MESSAGE_LENGTH // 6)[:LONG_MESSAGE_LENGTH],
+    }
+    weights = {"clean": 70, "curse": 10, "spam": 10, "homoglyph": 7, "long": 3}
+    categories = rnd.choices(list(weights), weights=list(weights.values()), k=size)
+    return [(category, makers[category]()) for category in categories]
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(share * len(values)) - 1))]
+
+
+def commit_id() -> str | None:
+    """Commit of the working tree, if it is a git repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Benchmark:
+    """
+    Throughput, latency and memory use of Filter checks on the benchmark corpus.
+    """
+
+    def __init__(self, filter_instance: Filter, corpus: list[tuple[str, str]], rounds: int = 3) -> None:
+        """
+        Build the benchmark.
+
+        :type filter_instance: ``Filter``
+        :param filter_instance: Filter to benchmark.
+
+        :type corpus: ``list[tuple[str, str]]``
+        :param corpus: Category and text of every message, see build_corpus.
+
+        :type rounds: ``int``
+        :param rounds: Count of timed passes over the corpus.
+        """
+
+        self.filter = filter_instance
+        self.corpus = corpus
+        self.rounds = rounds
+        self.username = NormalizedText.from_text("Иван")
+        # Every message is checked as a text, as a repost and as a whole message
+        self.methods: dict[str, Callable[[str], Awaitable[Any]]] = {
+            "check_text": lambda text: self.filter.check_text(
+                NormalizedText.from_text(text), self.username, True,
+            ),
+            "check_attachments": lambda text: self.filter.check_attachments(
+                [{"type": "wall", "wall": {"text": text}}], self.username, True,
+            ),
+            "filter_response": lambda text: self.filter.filter_response(
+                NormalizedText.from_text(text), "Иван", [], True,
+            ),
+        }
+
+    async def measure(self, name: str) -> dict[str, Any]:
+        """
+        Benchmark one method.
+
+        The first pass warms up compiled patterns and memos and isn't timed. The verdict cache is
+        cleared before every pass, so filter_response figures are of the checks, not of the cache.
+        Memory is traced in a separate pass, as tracemalloc slows every allocation down.
+        tracemalloc sees only live blocks, not allocations made and freed in between, so the figures
+        are the most memory a message takes above what it started with, and the blocks left after the pass.
+
+        :type name: ``str``
+        :param name: Method name, key of self.methods.
+
+        :return: Returns figures of the method.
+        :rtype: ``dict[str, Any]``
+        """
+
+        method = self.methods[name]
+        self.filter.verdict_cache.clear()
+        for _, text in self.corpus:
+            await method(text)
+
+        latencies: dict[str, list[float]] = {}
+        total = 0.0
+        for _ in range(self.rounds):
+            self.filter.verdict_cache.clear()
+            for category, text in self.corpus:
+                started = time.perf_counter_ns()
+                await method(text)
+                elapsed = (time.perf_counter_ns() - started) / 1e6
+                latencies.setdefault(category, []).append(elapsed)
+                total += elapsed
+
+        self.filter.verdict_cache.clear()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        message_peaks = []
+        for _, text in self.corpus:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await method(text)
+            _, peak = tracemalloc.get_traced_memory()
+            message_peaks.append(peak - current)
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        retained = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+
+        everything = sorted(latency for values in latencies.values() for latency in values)
+        return {
+            "messages": len(everything),
+            "seconds": round(total / 1e3, 4),
+            "messages_per_second": round(len(everything) / (total / 1e3), 1) if total else None,
+            "p50_ms": round(statistics.median(everything), 4),
+            "p99_ms": round(percentile(everything, 0.99), 4),
+            "message_peak_bytes_p50": int(statistics.median(message_peaks)),
+            "message_peak_bytes_max": max(message_peaks),
+            "retained_blocks": retained,
+            "categories": {
+                category: {
+                    "p50_ms": round(statistics.median(values), 4),
+                    "p99_ms": round(percentile(sorted(values), 0.99), 4),
+                }
+                for category, values in sorted(latencies.items())
+            },
+        }
+
+    async def run(self, methods: list[str] | None = None) -> dict[str, Any]:
+        """
+        Benchmark the methods.
+
+        :type methods: ``list[str] | None``
+        :param methods: Method names. All of them by default.
+
+        :return: Returns figures of all methods.
+        :rtype: ``dict[str, Any]``
+        """
+
+        results = {}
+        for name in methods or self.methods:
+            results[name] = await self.measure(name)
+            logger.info(
+                f"# {name}: {results[name]['messages_per_second']} msg/s, "
+                f"p50 {results[name]['p50_ms']} ms, p99 {results[name]['p99_ms']} ms"
+            )
+        return results
+
+
+async def main() -> None:
+    """Run the benchmark and save the results as JSON."""
+    parser = argparse.ArgumentParser(
+        prog="Filter benchmark",
+        description="This script measures Filter throughput and latency on a reproducible corpus",
+    )
+    parser.add_argument("-o", "--output", dest="path", help="JSON file to save results to", required=False)
+    parser.add_argument("-n", "--size", dest="size", type=int, default=1000, help="Count of corpus messages")
+    parser.add_argument("-s", "--seed", dest="seed", type=int, default=CORPUS_SEED, help="Corpus seed")
+    parser.add_argument("-r", "--rounds", dest="rounds", type=int, default=3, help="Count of timed passes")
+    parser.add_argument(
+        "-m",
+        "--method",
+        dest="methods",
+        action="append",
+        choices=["check_text", "check_attachments", "filter_response"],
+        help="Method to benchmark, all of them by default",
+    )
+    parser.add_argument("--mode", dest="match_mode", default=Filter_config.match_mode, help="Filter match mode")
+    parser.add_argument(
+        "--order", dest="pipeline_order", default=Filter_config.pipeline_order, help="Filter pipeline order",
+    )
+    args = parser.parse_args()
+
+    # Checks log every message at debug level, that is not what is measured
+    logger.remove()
+    logger.add(sys.stderr, level="INFO", format="{time:YYYY-MM-DD HH:mm:ss} - {level} - {message}")
+
+    corpus = build_corpus(args.seed, args.size)
+    started = time.perf_counter()
+    filter_instance = await Filter.create(
+        match_mode=args.match_mode, pipeline_order=args.pipeline_order, executor_workers=0, watch_rules=False,
+    )
+    create_seconds = time.perf_counter() - started
+    results = {
+        "commit": commit_id(),
+        "python": platform.python_version(),
+        "match_mode": args.match_mode,
+        "pipeline_order": args.pipeline_order,
+        "ruleset_version": filter_instance.ruleset.version,
+        "corpus": {
+            "version": CORPUS_VERSION,
+            "seed": args.seed,
+            "size": len(corpus),
+            "categories": {
+                category: sum(1 for item, _ in corpus if item == category)
+                for category in sorted({category for category, _ in corpus})
+            },
+        },
+        "rounds": args.rounds,
+        "create_seconds": round(create_seconds, 4),
+        "methods": await Benchmark(filter_instance, corpus, args.rounds).run(args.methods),
+    }
+    await filter_instance.close()
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.path:
+        with open(args.path, "w", encoding="utf-8") as results_file:
+            results_file.write(output)
+        logger.info(f"# Benchmark results were saved to {args.path}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
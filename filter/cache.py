@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class VerdictCache:
+    """
+    Bounded LRU cache of Filter verdicts with time to live.
+    Entries belong to the ruleset version they were computed with: when the version
+    changes, the whole cache is dropped.
+    """
+
+    def __init__(self, size: int = 10000, ttl: float = 600.0) -> None:
+        """
+        Build the cache.
+
+        :type size: ``int``
+        :param size: Max count of verdicts. 0 disables the cache.
+
+        :type ttl: ``float``
+        :param ttl: Seconds a verdict lives. 0 or less means forever.
+        """
+
+        self.size = size
+        self.ttl = ttl
+        self.version: str | None = None
+        self.entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def digest(*parts: str) -> bytes:
+        """
+        Hash the parts of the key, so long texts are not kept in the cache.
+
+        :type parts: ``str``
+        :param parts: Normalized texts the verdict depends on.
+
+        :return: Returns 16 bytes digest.
+        :rtype: ``bytes``
+        """
+
+        hasher = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            encoded = part.encode("utf-8", "surrogatepass")
+            # Length prefix keeps ("ab", "c") and ("a", "bc") apart
+            hasher.update(len(encoded).to_bytes(8, "little"))
+            hasher.update(encoded)
+        return hasher.digest()
+
+    def bind(self, version: str) -> None:
+        """Drop all verdicts if they were computed with other ruleset version."""
+        if version != self.version:
+            with self.lock:
+                if version != self.version:
+                    self.entries.clear()
+                    self.version = version
+
+    def get(self, key: Hashable, version: str) -> Any | None:
+        """
+        Get the verdict.
+
+        :type key: ``Hashable``
+        :param key: Cache key.
+
+        :type version: ``str``
+        :param version: Version of the ruleset in use.
+
+        :return: Returns the verdict or None if there is no live one.
+        """
+
+        if self.size <= 0:
+            return None
+        self.bind(version)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, verdict = entry
+            if self.ttl > 0 and expires < time.monotonic():
+                del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return verdict
+
+    def put(self, key: Hashable, version: str, verdict: Any) -> None:
+        """
+        Remember the verdict.
+
+        :type key: ``Hashable``
+        :param key: Cache key.
+
+        :type version: ``str``
+        :param version: Version of the ruleset the verdict was computed with.
+
+        :type verdict: ``Any``
+        :param verdict: Verdict to remember.
+        """
+
+        if self.size <= 0:
+            return
+        self.bind(version)
+        with self.lock:
+            if version != self.version:
+                # The ruleset was changed while the message was checked
+                return
+            self.entries[key] = (time.monotonic() + self.ttl, verdict)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all verdicts."""
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
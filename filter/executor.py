@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any
+
+from loguru import logger
+
+from config.logs import Logs
+from filter.reload import reload_ruleset
+
+# Filter of the worker process and the loop to run its checks on
+worker_filter = None
+worker_loop: asyncio.AbstractEventLoop | None = None
+# Ruleset version the worker has reloaded Words_DB for the last time
+worker_requested_version: str | None = None
+
+
+def init_worker(match_mode: str, pipeline_order: str) -> None:
+    """
+    Build the Filter with compiled ruleset once per worker process.
+
+    :type match_mode: ``str``
+    :param match_mode: Filter match mode.
+
+    :type pipeline_order: ``str``
+    :param pipeline_order: Filter pipeline order.
+    """
+
+    global worker_filter, worker_loop
+    # Import here, filter.main imports this module
+    from filter.main import Filter
+
+    logger.remove()
+    logger.add(
+        Logs.filter_log,
+        level="INFO",
+        format="{time:YYYY-MM-DD HH:mm:ss} - {level} - {message}",
+    )
+    worker_loop = asyncio.new_event_loop()
+    worker_filter = worker_loop.run_until_complete(
+        Filter.create(
+            match_mode=match_mode,
+            pipeline_order=pipeline_order,
+            executor_workers=0,
+            watch_rules=False,
+            dump_rule_stats=False,
+        )
+    )
+
+
+def run_check(method: str, *args: Any, version: str | None = None) -> Any:
+    """
+    Run Filter check in the worker process.
+
+    :type method: ``str``
+    :param method: Filter method name, like "check_text".
+
+    :type args: ``Any``
+    :param args: Method arguments.
+
+    :type version: ``str | None``
+    :param version: Ruleset version the bot process checks with. If the worker has other one,
+        it reloads Words_DB once for this version.
+
+    :return: Returns the check result.
+    """
+
+    global worker_requested_version
+    if version is not None and version != worker_filter.ruleset.version and version != worker_requested_version:
+        worker_requested_version = version
+        worker_filter.swap_ruleset(reload_ruleset(worker_filter.match_mode))
+    return worker_loop.run_until_complete(getattr(worker_filter, method)(*args))
+
+
+def warm_up() -> int:
+    """Run a check, so the worker has everything compiled and cached. Returns worker PID."""
+    from filter.normalization import NormalizedText
+
+    run_check("check_text", NormalizedText.from_text("warm up"), NormalizedText.from_text(""), True)
+    return os.getpid()
+
+
+class FilterExecutor:
+    """
+    Pool of worker processes running Filter checks.
+    Checks are CPU bound regex work, so in the pool they don't stop the event loop of the bot.
+    Every worker holds its own Filter and compiled ruleset.
+    """
+
+    def __init__(self, workers: int, match_mode: str, pipeline_order: str) -> None:
+        """
+        Start the pool.
+
+        :type workers: ``int``
+        :param workers: Count of worker processes.
+
+        :type match_mode: ``str``
+        :param match_mode: Filter match mode.
+
+        :type pipeline_order: ``str``
+        :param pipeline_order: Filter pipeline order.
+        """
+
+        self.workers = workers
+        # Spawned workers don't inherit the running loop and threads of the bot
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(match_mode, pipeline_order),
+        )
+
+    async def warm_up(self) -> int:
+        """
+        Start all workers and run a check in every one of them.
+
+        :return: Returns count of started workers.
+        :rtype: ``int``
+        """
+
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(loop.run_in_executor(self.pool, warm_up) for _ in range(self.workers)))
+        return len(set(pids))
+
+    async def run(self, method: str, *args: Any, version: str | None = None) -> Any:
+        """
+        Run Filter check in the pool and await its result.
+
+        :type method: ``str``
+        :param method: Filter method name, like "check_text".
+
+        :type args: ``Any``
+        :param args: Method arguments, they must be picklable.
+
+        :type version: ``str | None``
+        :param version: Ruleset version to check with, workers reload Words_DB to catch up with it.
+
+        :return: Returns the check result.
+        """
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, partial(run_check, method, *args, version=version))
+
+    def shutdown(self) -> None:
+        """Stop the workers."""
+        self.pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator
+
+QUANTIFIER_PATTERN = re.compile(r"\{\d*(?:,\d*)?\}")
+GROUP_PREFIX_PATTERN = re.compile(r"\(\?(?:[:=!]|<=|<!|P<\w+>)")
+WORD_PATTERN = re.compile(r"\w", re.UNICODE)
+SYNTAX_CHARS = frozenset("()|?*+^$.")
+
+
+class HomoglyphFolding:
+    """
+    Folding of look-alike characters to Cyrillic skeleton by precomputed str.translate table.
+
+    Table is derived from Words_DB.blacklists.abc and the patterns built from it. Some characters
+    stand for several letters (like '3' for 'е', 'з' and 'э'), so characters are grouped by
+    the character classes and literals of the patterns they belong to, and every group is folded
+    to one representative. Folded pattern has a couple of representatives instead of the whole
+    character class, and it matches folded text exactly where the source pattern matches the text.
+    """
+
+    def __init__(self, abc: dict[str, str], patterns: Iterable[str] = ()) -> None:
+        """
+        Build the folding table.
+
+        :type abc: ``dict[str, str]``
+        :param abc: Letters and their character classes, like {'а': '[a4а@]'}.
+
+        :type patterns: ``Iterable[str]``
+        :param patterns: Regexes to be folded with this table.
+        """
+
+        atoms = [frozenset(char_class[1:-1]) for char_class in abc.values()]
+        for source in patterns:
+            try:
+                atoms.extend(atom for kind, atom in self.parse(source) if kind != "syntax")
+            except ValueError:
+                # Such pattern is not folded, see fold_pattern
+                continue
+
+        atoms_of: dict[str, set[int]] = {}
+        for index, atom in enumerate(atoms):
+            for char in atom:
+                atoms_of.setdefault(char, set()).add(index)
+
+        groups: dict[tuple, list[str]] = {}
+        for char, indexes in atoms_of.items():
+            # Word and space characters are never folded to other ones, so \w, \s and
+            # their opposites stay the same for folded text
+            key = (frozenset(indexes), bool(WORD_PATTERN.match(char)), char.isspace())
+            groups.setdefault(key, []).append(char)
+
+        self.table: dict[int, str] = {}
+        for chars in groups.values():
+            representative = min(chars, key=self.representative_rank)
+            for char in chars:
+                if char != representative:
+                    self.table[ord(char)] = representative
+
+    @staticmethod
+    def representative_rank(char: str) -> tuple:
+        """Cyrillic letters go first."""
+        return (not "а" <= char <= "я", char)
+
+    @staticmethod
+    def parse(source: str) -> Iterator[tuple[str, object]]:
+        """
+        Split the regex into syntax and characters it matches.
+
+        :type source: ``str``
+        :param source: Regex.
+
+        :return: Yields ("syntax", text), ("literal", chars) or ("class", chars) pairs.
+        :rtype: ``Iterator[tuple[str, object]]``
+        """
+
+        position = 0
+        while position < len(source):
+            char = source[position]
+            if char == "\\":
+                escaped = source[position + 1:position + 2]
+                if escaped.isalnum():
+                    # \s, \w, \b and so on
+                    yield "syntax", source[position:position + 2]
+                else:
+                    yield "literal", frozenset(escaped)
+                position += 2
+                continue
+            special = QUANTIFIER_PATTERN.match(source, position) or GROUP_PREFIX_PATTERN.match(source, position)
+            if special:
+                yield "syntax", special.group()
+                position = special.end()
+                continue
+            if char == "[":
+                end = source.find("]", position + 1)
+                body = source[position + 1:end]
+                if end < 0 or body.startswith("^") or "\\" in body or "-" in body or "[" in body:
+                    raise ValueError(f"Unsupported character class in {source}")
+                yield "class", frozenset(body)
+                position = end + 1
+                continue
+            if char in SYNTAX_CHARS:
+                yield "syntax", char
+            else:
+                yield "literal", frozenset(char)
+            position += 1
+
+    def fold(self, text: str) -> str:
+        """
+        Fold the text to Cyrillic skeleton.
+        Every character is replaced with one character, so positions in folded text
+        are the same as in the source text.
+
+        :type text: ``str``
+        :param text: Lowered text.
+
+        :return: Returns folded text.
+        :rtype: ``str``
+        """
+
+        return text.translate(self.table)
+
+    def fold_pattern(self, source: str) -> str:
+        """
+        Fold the regex to match folded text.
+
+        :type source: ``str``
+        :param source: Regex from Words_DB.
+
+        :raises ValueError: If the regex has character class this folding can't handle.
+
+        :return: Returns folded regex.
+        :rtype: ``str``
+        """
+
+        folded = []
+        for kind, value in self.parse(source):
+            if kind == "syntax":
+                folded.append(value)
+                continue
+            chars = sorted({self.table.get(ord(char), char) for char in value})
+            if kind == "literal" and len(chars) == 1:
+                folded.append(re.escape(chars[0]))
+            else:
+                folded.append("[" + "".join(re.escape(char) for char in chars) + "]")
+        return "".join(folded)
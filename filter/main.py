@@ -0,0 +1,1204 @@
+# -*- coding: utf-8 -*-
+# Reviewed: July 23, 2025
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+from typing import AsyncIterator, Iterable
+
+from loguru import logger
+from loguru import logger as filter_log
+from dataclasses import dataclass, replace
+
+from config.filter import Filter_config
+from config.logs import Logs
+from config.words_db import Words_DB
+from config.tlg import Telegram
+from filter.cache import VerdictCache
+from filter.executor import FilterExecutor
+from filter.near_duplicates import NearDuplicateIndex
+from filter.normalization import NormalizedText
+from filter.pipeline import CheckContext, Pipeline, Stage
+from filter.reload import RulesetWatcher
+from filter.ruleset import CompiledRule, CompiledRuleset
+from filter.scoring import Features, SuspiciousScorer, load_weights
+from filter.stats import RuleStats, write_snapshot
+from filter.tokens import TokenMatcher
+from tracing import get_tracer
+
+PHONE_PATTERN = re.compile(r"\+?[0-9]{1}[ ‑\-]?\d{3}[ ‑\-]?\d{3}[ ‑\-]?\d{2}[ ‑\-]?\d{2}")
+CARD_PATTERN = re.compile(r"\b\d{16}\b")
+
+trace = get_tracer("filter")
+
+
+@dataclass(frozen=True)
+class Result:
+    """
+    Filter verdict. Every check returns a new one, so verdicts are never shared between messages.
+    """
+    # Result = 0 - false
+    # Result = 1 - true
+    # Result = 2 - suspicious
+
+    result: int = 0
+    text: str = ""
+    case_description: str = ""
+
+
+class Filter:
+    # To avoid async __init__
+    @classmethod
+    async def create(
+        cls,
+        filter_log: logger = filter_log,  # type: ignore
+        debug_enabled: bool = False,
+        match_mode: str = Filter_config.match_mode,
+        pipeline_order: str = Filter_config.pipeline_order,
+        executor_workers: int = Filter_config.executor_workers,
+        watch_rules: bool = Filter_config.reload_interval > 0,
+        dump_rule_stats: bool = Filter_config.rule_stats_interval > 0,
+    ) -> Filter:
+        """
+        Filter class init
+
+        :type aux: ``auxiliary``
+        :param aux: Auxiliary class instance.
+
+        :type filter_log: ``logger``
+        :param filter_log: Logger instance.
+
+        :type debug_enabled: ``bool``
+        :param debug_enabled: Boolean to switch on and off debugging. False by default.
+
+        :type match_mode: ``str``
+        :param match_mode: How rules are matched: "classes", "skeleton", "verify" or "tokens".
+            See Filter_config.match_mode.
+
+        :type pipeline_order: ``str``
+        :param pipeline_order: Order of check_text stages: "cost" or "compat". See Filter_config.pipeline_order.
+
+        :type executor_workers: ``int``
+        :param executor_workers: Count of worker processes to run checks in. 0 runs them on the event loop.
+
+        :type watch_rules: ``bool``
+        :param watch_rules: Reload the ruleset when config/words_db.py is changed. See Filter_config.reload_interval.
+
+        :type dump_rule_stats: ``bool``
+        :param dump_rule_stats: Save per rule counters periodically. See Filter_config.rule_stats_interval.
+
+        :return: Returns the class instance.
+        """
+
+        self = cls()
+        if filter_log is None:
+            if debug_enabled:
+                filter_log.add(
+                    Logs.filter_log,
+                    level="DEBUG",
+                    format="{time:YYYY-MM-DD HH:mm:ss} - {level} - {message}",
+                )
+                filter_log.debug("# Filter class will run in Debug mode.")
+            else:
+                filter_log.add(
+                    Logs.filter_log,
+                    level="INFO",
+                    format="{time:YYYY-MM-DD HH:mm:ss} - {level} - {message}",
+                )
+            self.filter_log = filter_log
+        else:
+            self.filter_log = filter_log
+        # The only state of the Filter. It is never changed by checks,
+        # so one instance can serve concurrent messages.
+        self.ruleset = CompiledRuleset.from_words_db(Words_DB, token_memo_size=Filter_config.token_memo_size)
+        self.match_mode = match_mode
+        if match_mode in ("classes", "verify"):
+            self.ruleset.compile_patterns()
+        self.pipeline = Pipeline(self.build_stages(), order=pipeline_order)
+        # Weights of suspicious rules, the scorer is built for the ruleset in use
+        self.suspicious_scoring = Filter_config.suspicious_scoring
+        try:
+            self.suspicious_weights = load_weights(Filter_config.suspicious_weights_path)
+        except (OSError, ValueError) as error:
+            self.filter_log.warning(
+                f"# Can't load suspicious weights {Filter_config.suspicious_weights_path}: {error}, using 1.0"
+            )
+            self.suspicious_weights = load_weights("")
+        self.scorer: SuspiciousScorer | None = None
+        # Verdicts of messages already seen. Spam waves send the same text from many accounts.
+        self.verdict_cache = VerdictCache(
+            size=Filter_config.verdict_cache_size,
+            ttl=Filter_config.verdict_cache_ttl,
+        )
+        # Recent messages of all senders to catch slightly changed copies of the same spam
+        self.near_duplicates = None
+        if Filter_config.near_duplicate_senders > 0:
+            self.near_duplicates = NearDuplicateIndex(
+                window=Filter_config.near_duplicate_window,
+                size=Filter_config.near_duplicate_index_size,
+                similarity=Filter_config.near_duplicate_similarity,
+                min_length=Filter_config.near_duplicate_min_length,
+                senders_limit=Filter_config.near_duplicate_senders,
+            )
+        # Checks are CPU bound, so they may run in worker processes. Cache and
+        # near duplicates index stay here, as they are shared by all messages.
+        self.executor = None
+        if executor_workers > 0:
+            self.executor = FilterExecutor(executor_workers, match_mode, pipeline_order)
+            started = await self.executor.warm_up()
+            self.filter_log.info(f"# Filter checks run in {started} worker processes.")
+        # Word lists are updated without restart of the bot
+        self.watcher_task = None
+        if watch_rules:
+            self.watcher_task = asyncio.create_task(RulesetWatcher(self).run())
+        # Cost and hits of every rule, to find dead and expensive ones
+        self.rule_stats = RuleStats() if Filter_config.rule_stats else None
+        self.rule_stats_task = None
+        if self.rule_stats is not None and dump_rule_stats and Filter_config.rule_stats_path:
+            self.rule_stats_task = asyncio.create_task(self.dump_rule_stats_periodically())
+        return self
+
+    def swap_ruleset(self, ruleset: CompiledRuleset) -> None:
+        """
+        Filter class method to start checking with new ruleset.
+        Checks in flight finish with the ruleset they started with, cached verdicts of the old one are dropped.
+
+        :type ruleset: ``CompiledRuleset``
+        :param ruleset: New ruleset.
+        """
+
+        self.ruleset = ruleset
+        self.filter_log.info(f"# Filter ruleset is reloaded, version {ruleset.version[:12]}.")
+
+    def rule_stats_snapshot(self, reset: bool = False) -> dict | None:
+        """
+        Filter class method to get per rule counters: executions, matches, whitelisted words and time.
+        Rules of the current ruleset which were never run are listed with zero counters.
+
+        :type reset: ``bool``
+        :param reset: Drop the counters after the copy is taken.
+
+        :return: Returns counters of every list with its rules, the most expensive rules first,
+            or None if counters are switched off.
+        :rtype: ``dict | None``
+        """
+
+        if self.rule_stats is None:
+            return None
+        return self.rule_stats.snapshot(self.ruleset, reset)
+
+    async def dump_rule_stats_periodically(self) -> None:
+        """Save per rule counters to Filter_config.rule_stats_path and drop them, until cancelled."""
+        while True:
+            await asyncio.sleep(Filter_config.rule_stats_interval)
+            try:
+                # Counters are copied and dropped on the event loop, checks change them there,
+                # and only the copy is written in a thread
+                snapshot = self.rule_stats.snapshot(self.ruleset, reset=True)
+                await asyncio.to_thread(write_snapshot, Filter_config.rule_stats_path, snapshot)
+            except Exception as error:
+                self.filter_log.warning(f"# Can't save rule stats to {Filter_config.rule_stats_path}: {error}")
+
+    async def close(self) -> None:
+        """
+        Filter class method to stop background tasks and worker processes, if they are.
+        """
+
+        for task in (self.watcher_task, self.rule_stats_task):
+            if task is not None:
+                task.cancel()
+        self.watcher_task = None
+        self.rule_stats_task = None
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    # Message filter. Returns Result with verdict and text
+    @filter_log.catch
+    async def filter_response(
+        self,
+        text: NormalizedText,
+        username: str,
+        attachments: str,
+        is_member: bool,
+        sender_id: int | None = None,
+    ) -> Result:
+        """
+        Filter class method to filter provided text and/or attachments.
+
+        :type text: ``NormalizedText``
+        :param text: Text to check, normalized once per message.
+
+        :type username: ``str``
+        :param username: Username to check.
+
+        :type attachments: ``str``
+        :param attachments: Attachments to check.
+
+        :type is_member: ``bool``
+        :param is_member: Is user member of the public.
+
+        :type sender_id: ``int | None``
+        :param sender_id: User ID. If provided, the message is checked for mass mailing.
+
+        :return: Returns the result.
+        :rtype: ``Result``
+        """
+
+        trace("================ Filter response ==================")
+        trace("# Filtering response")
+        if is_member is None:
+            is_member = True
+        username = NormalizedText.from_text(username)
+        # The whole message is checked with one ruleset, even if a new one comes meanwhile
+        ruleset = self.ruleset
+        # Username changes the verdict only by being in Latin
+        cache_key = await self.verdict_cache_key(text, username, attachments, is_member)
+        verdict = None
+        if cache_key is not None:
+            verdict = self.verdict_cache.get(cache_key, ruleset.version)
+        if verdict is not None:
+            trace("# Verdict was found in cache")
+        else:
+            if self.executor is not None:
+                verdict = await self.executor.run(
+                    "check_message", text, username, attachments, is_member, version=ruleset.version
+                )
+            else:
+                verdict = await self.check_message(text, username, attachments, is_member, ruleset)
+            if verdict is not None and cache_key is not None:
+                self.verdict_cache.put(cache_key, ruleset.version, verdict)
+
+        # Every message of the sender goes to near duplicates index, even already caught one
+        if sender_id is not None:
+            mass_mailing_result = await self.check_for_mass_mailing(text, sender_id, ruleset)
+            if mass_mailing_result and mass_mailing_result.result == 2:
+                if verdict is None or verdict.result == 0:
+                    return mass_mailing_result
+        return verdict
+
+    @filter_log.catch
+    async def check_message(
+        self,
+        text: NormalizedText,
+        username: NormalizedText,
+        attachments: str,
+        is_member: bool,
+        ruleset: CompiledRuleset | None = None,
+    ) -> Result:
+        """
+        Filter class method to run all checks for the message, bypassing the verdict cache.
+
+        :type text: ``NormalizedText``
+        :param text: Text to check.
+
+        :type username: ``NormalizedText``
+        :param username: Username to check.
+
+        :type attachments: ``str``
+        :param attachments: Attachments to check.
+
+        :type is_member: ``bool``
+        :param is_member: Is user member of the public.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to check with. The current one by default.
+
+        :return: Returns the result.
+        :rtype: ``Result``
+        """
+
+        if ruleset is None:
+            ruleset = self.ruleset
+        # Attachments checks
+        check_attachments_result = await self.check_attachments(
+            attachments, username, is_member, ruleset
+        )
+        if check_attachments_result:
+            if check_attachments_result.result > 0:
+                return check_attachments_result
+
+        # Text check
+        check_text_result = await self.check_text(text, username, is_member, ruleset)
+        if check_text_result:
+            if check_text_result.result > 0:
+                return check_text_result
+
+        return Result()
+
+    @filter_log.catch
+    async def verdict_cache_key(
+        self,
+        text: NormalizedText,
+        username: NormalizedText,
+        attachments: str,
+        is_member: bool,
+    ) -> tuple:
+        """
+        Filter class method to build the verdict cache key from everything the verdict depends on:
+        normalized text and its count of custom emoji, link URLs and repost texts of attachments,
+        membership and whether the username is in Latin.
+
+        :type text: ``NormalizedText``
+        :param text: Text to check.
+
+        :type username: ``NormalizedText``
+        :param username: Username to check.
+
+        :type attachments: ``str``
+        :param attachments: Attachments to check.
+
+        :type is_member: ``bool``
+        :param is_member: Is user member of the public.
+
+        :return: Returns the key.
+        :rtype: ``tuple``
+        """
+
+        parts = [text.folded]
+        for attachment in attachments or []:
+            kind = attachment["type"]
+            if kind == "link":
+                parts += [kind, NormalizedText.from_text(attachment["link"]["url"]).stripped]
+            elif kind == "wall" or kind == "wall_reply":
+                parts += [kind, NormalizedText.from_text(attachment[kind]["text"]).folded]
+        return (
+            VerdictCache.digest(*parts),
+            # Emoji scam check counts custom emoji drawn over the text
+            text.custom_emoji,
+            bool(is_member),
+            await self.check_for_english(username),
+        )
+
+    # Batch filter for backfills and replays. Yields message and its Result
+    async def check_many(self, messages: Iterable[dict]) -> AsyncIterator[tuple[dict, Result]]:
+        """
+        Filter class method to filter a batch of messages.
+        Identical messages are checked once and texts are normalized once per batch,
+        verdicts are streamed in the order of messages.
+
+        :type messages: ``Iterable[dict]``
+        :param messages: Messages as dicts with filter_response arguments:
+            text (``str`` or ``NormalizedText``), username, attachments, is_member and sender_id.
+            Missing attachments are empty, missing is_member is True, missing sender_id skips
+            the mass mailing check.
+
+        :return: Yields pairs of the message and its result.
+        :rtype: ``AsyncIterator[tuple[dict, Result]]``
+        """
+
+        trace("# Filtering batch of messages")
+        verdicts: dict[tuple, Result] = {}
+        texts: dict[str, NormalizedText] = {}
+        for count, message in enumerate(messages, start=1):
+            text = message.get("text")
+            if not isinstance(text, NormalizedText):
+                raw = text or ""
+                text = texts.get(raw)
+                if text is None:
+                    text = texts[raw] = NormalizedText.from_text(raw)
+            attachments = message.get("attachments") or []
+            is_member = message.get("is_member", True)
+            key = (
+                self.ruleset.version,
+                text.raw,
+                message.get("username"),
+                message.get("sender_id"),
+                is_member,
+                json.dumps(attachments, sort_keys=True, ensure_ascii=False, default=str) if attachments else "",
+            )
+            verdict = verdicts.get(key)
+            if verdict is None:
+                verdict = await self.filter_response(
+                    text, message.get("username"), attachments, is_member, message.get("sender_id")
+                )
+                if len(verdicts) >= Filter_config.batch_memo_size:
+                    verdicts.clear()
+                    texts.clear()
+                verdicts[key] = verdict
+            yield message, verdict
+            # Let other tasks run during long batches
+            if count % Filter_config.batch_yield_every == 0:
+                await asyncio.sleep(0)
+
+    # Check of attachments for links and bad things in repost/reply
+    @filter_log.catch
+    async def check_attachments(
+        self,
+        attachments: str,
+        username: NormalizedText,
+        is_member: bool = True,
+        ruleset: CompiledRuleset | None = None,
+    ) -> Result:
+        """
+        Filter class method to check attachments.
+
+        :type attachments: ``str``
+        :param attachments: Attachments to check.
+
+        :type username: ``NormalizedText``
+        :param username: Username to check.
+
+        :type is_member: ``bool``
+        :param is_member: Is user member of the public. True by default.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to check with. The current one by default.
+
+        :return: Returns the result.
+        :rtype: ``Result``
+        """
+
+        if ruleset is None:
+            ruleset = self.ruleset
+        for attachment in attachments:
+            trace("# Checking attachment of type {}", attachment['type'])
+            # Links
+            if attachment["type"] == "link":
+                url = NormalizedText.from_text(attachment["link"]["url"])
+                item = await self.spam_check(url.stripped, ruleset)
+                if item is not None:
+                    msg = f"Forbidden '{item.replace('.', '[.]')}' from spam list was found in attachment!"
+                    trace("# {}", msg)
+                    return Result(
+                        result=1,
+                        text=msg,
+                        case_description="подозрительная ссылка, спам, реклама.",
+                    )
+            # Repost content and Repost comment content
+            if (
+                attachment["type"] == "wall"
+                or attachment["type"] == "wall_reply"
+            ):
+                key = attachment["type"]
+                check_wall_result = await self.check_text(
+                    NormalizedText.from_text(attachment[key]["text"]),
+                    username,
+                    is_member,
+                    ruleset,
+                )
+                if check_wall_result:
+                    return replace(
+                        check_wall_result,
+                        case_description=check_wall_result.case_description + " Вложение.",
+                    )
+        return Result()
+
+    @filter_log.catch
+    async def check_text(
+        self,
+        text_to_check: NormalizedText,
+        username: NormalizedText,
+        is_member: bool = True,
+        ruleset: CompiledRuleset | None = None,
+    ) -> Result:
+        """
+        Filter class method to check text.
+
+        :type text_to_check: ``NormalizedText``
+        :param text_to_check: Text to check.
+
+        :type username: ``NormalizedText``
+        :param username: Username to check.
+
+        :type is_member: ``bool``
+        :param is_member: Is user member of the public. True by default.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to check with. The current one by default.
+
+        :return: Returns the result.
+        :rtype: ``Result``
+        """
+
+        if ruleset is None:
+            ruleset = self.ruleset
+        if self.executor is not None:
+            return await self.executor.run("check_text", text_to_check, username, is_member, version=ruleset.version)
+
+        trace("# # Checking text: {}", text_to_check)
+        verdict = await self.pipeline.run(CheckContext(text_to_check, username, is_member, ruleset))
+        if verdict is not None:
+            return verdict
+
+        # If user send a picture and user name is in English - warn me
+        # if user_check != [] and attachment_flag:
+        #     return False, f"# {username} with attachment was caught"
+        return Result()
+
+    def build_stages(self) -> tuple[Stage, ...]:
+        """
+        Filter class method to declare check_text stages in compatibility order.
+        Costs are relative, measured on typical chat messages.
+
+        :return: Returns the stages.
+        :rtype: ``tuple[Stage, ...]``
+        """
+
+        # Latin, phone and card checks ran after the spam list check, but their suspicious verdicts
+        # were always reset by the next checks, so they are stages only if switched on.
+        # The latest of them in this order wins, so their priorities go backwards.
+        bot_stages = ()
+        if Filter_config.bot_heuristics:
+            bot_stages = (
+                Stage("latin_username", self.stage_latin_username, cost=1, verdicts=frozenset({2}), priority=6, settles=True),
+                Stage("phone", self.stage_phone, cost=1, verdicts=frozenset({2}), priority=5, settles=True),
+                Stage("card", self.stage_card, cost=1, verdicts=frozenset({2}), priority=4, settles=True),
+                Stage("latin", self.stage_latin, cost=1, verdicts=frozenset({2}), priority=3, settles=True),
+            )
+        return (
+            # Spam list check
+            Stage("links", self.stage_links, cost=3, verdicts=frozenset({1})),
+            *bot_stages,
+            # Curses list check
+            Stage("curses", self.stage_curses, cost=20, verdicts=frozenset({1})),
+            # If we have more than X suspicious words - kill it
+            Stage("suspicious_words", self.stage_suspicious_words, cost=40, verdicts=frozenset({1, 2}), priority=7),
+            # Check for scam messages consisting of Telegram prem emoji
+            Stage("non_text", self.stage_non_text, cost=1, verdicts=frozenset({2}), priority=8),
+        )
+
+    async def text_is_latin(self, context: CheckContext) -> bool:
+        """Check the text for Latinic once per message."""
+        if context.text_is_latin is None:
+            context.text_is_latin = await self.check_for_english(context.text)
+        return context.text_is_latin
+
+    @filter_log.catch
+    async def stage_links(self, context: CheckContext) -> Result:
+        """check_text stage: links from Spam list."""
+        return await self.check_for_links(context.text, context.ruleset)
+
+    @filter_log.catch
+    async def stage_latin_username(self, context: CheckContext) -> Result:
+        """check_text stage: message contains mishmash and user name is in English."""
+        if await self.text_is_latin(context):
+            if context.username_is_latin is None:
+                context.username_is_latin = await self.check_for_english(context.username)
+            if context.username_is_latin:
+                return Result(
+                    result=2,
+                    text=f"'{context.text}' was caught.",
+                    case_description="сообщение на латинице, имя пользователя на латинице, вероятно, бот.",
+                )
+        return Result()
+
+    @filter_log.catch
+    async def stage_phone(self, context: CheckContext) -> Result:
+        """check_text stage: phone numbers."""
+        if await self.check_for_phone(context.text):
+            return Result(
+                result=2,
+                text=f"'{context.text}' was caught.",
+                case_description="номер телефона в тексте, вероятно, бот.",
+            )
+        return Result()
+
+    @filter_log.catch
+    async def stage_card(self, context: CheckContext) -> Result:
+        """check_text stage: bank card numbers."""
+        if await self.check_for_card(context.text):
+            return Result(
+                result=2,
+                text=f"'{context.text}' was caught.",
+                case_description="номер банковской карточки в тексте, вероятно, бот.",
+            )
+        return Result()
+
+    @filter_log.catch
+    async def stage_latin(self, context: CheckContext) -> Result:
+        """check_text stage: message contains mishmash."""
+        if await self.text_is_latin(context):
+            return Result(
+                result=2,
+                text=f"'{context.text}' was caught.",
+                case_description="сообщение на латинице, вероятно, бот.",
+            )
+        return Result()
+
+    @filter_log.catch
+    async def stage_curses(self, context: CheckContext) -> Result:
+        """check_text stage: curses list."""
+        return await self.check_for_curses(context.text, context.ruleset)
+
+    @filter_log.catch
+    async def stage_suspicious_words(self, context: CheckContext) -> Result:
+        """check_text stage: suspicious words."""
+        return await self.check_for_suspicious_words(context.text, context.is_member, context.ruleset)
+
+    @filter_log.catch
+    async def stage_non_text(self, context: CheckContext) -> Result:
+        """check_text stage: emoji scam."""
+        if await self.check_for_non_text(text_to_check=context.text):
+            return Result(
+                result=2,
+                text=f"'{context.text}' was caught.",
+                case_description="сообщение, состоящее из эмодзи. Вероятно, бот.",
+            )
+        return Result()
+
+    @filter_log.catch
+    async def check_for_english(self, text_to_check: NormalizedText) -> bool:
+        """
+        Filter class method to check text for containing Latinic.
+
+        :type text_to_check: ``NormalizedText``
+        :param text_to_check: Text to check.
+
+        :return: Returns the result as boolean.
+        :rtype: ``bool``
+        """
+
+        trace("# Checking for english")
+        if text_to_check:
+            profile = text_to_check.profile
+            # Latin letter followed by any character, the way [A-Za-z].+ has always matched
+            if 0 <= profile.first_latin < profile.length - 1:
+                return True
+        else:
+            trace("# Text is None")
+        return False
+
+    @filter_log.catch
+    async def check_for_suspicious_words(
+        self,
+        text_to_check: NormalizedText,
+        is_member: bool = True,
+        ruleset: CompiledRuleset | None = None,
+    ) -> Result:
+        """
+        Filter class method to check text for suspicious words from according list.
+
+        :type text_to_check: ``NormalizedText``
+        :param text_to_check: Text to check.
+
+        :type is_member: ``bool``
+        :param is_member: Is user member of the public. Non members get one more suspicious point.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to check with. The current one by default.
+
+        :return: Returns the result.
+        :rtype: ``Result``
+        """
+
+        if ruleset is None:
+            ruleset = self.ruleset
+        if text_to_check:
+            trace("# # Checking for suspicious words")
+            # If we have more than X words - kill it
+            max_points = ruleset.suspicious_points_limit
+
+            discovered_words, features = await self.find_suspicious_words(text_to_check, ruleset)
+
+            result_len = 0
+            if discovered_words != []:
+                if self.suspicious_scoring == "weighted":
+                    result_len = self.scorer_for(ruleset).score(features, is_member)
+                else:
+                    result_len = len(discovered_words)
+                    if not is_member:
+                        result_len += 1
+
+                if result_len >= max_points:
+                    msg = f"Suspicious '{discovered_words}' was found.\nMore than {max_points} suspicious words were found."
+                    trace("# {}", msg)
+                    return Result(
+                        result=1,
+                        text=msg,
+                        case_description="подозрительный набор слов, спам, реклама.",
+                    )
+
+                if result_len > 0 and result_len < max_points:
+                    if discovered_words != []:
+                        msg = f"Limit of {max_points} is not exceeded."
+                    else:
+                        msg = f"Suspicious '{discovered_words}' was found. Limit of {max_points} is not exceeded."
+                    trace("# {}", msg)
+                    return Result(
+                        result=2,
+                        text=msg,
+                        case_description="недостаточно подозрительных слов для удаления сообщения.",
+                    )
+        else:
+            trace("# Text is None")
+        return Result()
+
+    @filter_log.catch
+    async def find_suspicious_words(
+        self,
+        text_to_check: NormalizedText,
+        ruleset: CompiledRuleset | None = None,
+    ) -> tuple[list[str], Features]:
+        """
+        Filter class method to find words of suspicious_regex and suspicious_list.
+
+        :type text_to_check: ``NormalizedText``
+        :param text_to_check: Text to check.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to check with. The current one by default.
+
+        :return: Returns found words and the sparse vector of their counts by rule, see SuspiciousScorer.
+        :rtype: ``tuple[list[str], Features]``
+        """
+
+        if ruleset is None:
+            ruleset = self.ruleset
+        counts = [0] * (len(ruleset.suspicious_regex) + len(ruleset.suspicious_list))
+        tokens = await self.tokenize(text_to_check, ruleset)
+        discovered_words = await self.regex_check(
+            ruleset.suspicious_regex,
+            text_to_check=text_to_check.folded,
+            list_name="suspicious_regex",
+            skeleton=await self.fold_homoglyphs(text_to_check, ruleset),
+            screen=ruleset.suspicious_screen,
+            tokens=tokens,
+            matcher=ruleset.suspicious_regex_tokens,
+            ruleset=ruleset,
+            counts=counts,
+        )
+        list_counts = [0] * len(ruleset.suspicious_list)
+        discovered_words += await self.regex_check(
+            ruleset.suspicious_list,
+            text_to_check=text_to_check.folded,
+            list_name="suspicious_list",
+            tokens=tokens,
+            matcher=ruleset.suspicious_list_tokens,
+            ruleset=ruleset,
+            counts=list_counts,
+        )
+        counts[len(ruleset.suspicious_regex):] = list_counts
+        return discovered_words, SuspiciousScorer.features(counts)
+
+    def scorer_for(self, ruleset: CompiledRuleset) -> SuspiciousScorer:
+        """
+        Filter class method to get the scorer of suspicious words for the ruleset.
+
+        :type ruleset: ``CompiledRuleset``
+        :param ruleset: Ruleset the features are found with.
+
+        :return: Returns the scorer.
+        :rtype: ``SuspiciousScorer``
+        """
+
+        scorer = self.scorer
+        if scorer is None or scorer.version != ruleset.version:
+            weights, non_member = self.suspicious_weights
+            scorer = self.scorer = SuspiciousScorer(ruleset, weights, non_member)
+        return scorer
+
+    async def score_many(self, messages: Iterable[tuple[NormalizedText, bool]]) -> list[float]:
+        """
+        Filter class method to score suspicious words of many messages at once, for backfill and replay.
+        Scores are weighted whatever Filter_config.suspicious_scoring is.
+
+        :type messages: ``Iterable[tuple[NormalizedText, bool]]``
+        :param messages: Text of every message and if its sender is a member of the public.
+
+        :return: Returns scores in the order of messages. Score not less than suspicious_points_limit
+            removes the message.
+        :rtype: ``list[float]``
+        """
+
+        ruleset = self.ruleset
+        batch = []
+        for number, (text, is_member) in enumerate(messages, 1):
+            _, features = await self.find_suspicious_words(text, ruleset) if text else ([], ())
+            batch.append((features, is_member))
+            if number % Filter_config.batch_yield_every == 0:
+                await asyncio.sleep(0)
+        return self.scorer_for(ruleset).score_batch(batch)
+
+    @filter_log.catch
+    async def check_for_links(self, text_to_check: NormalizedText, ruleset: CompiledRuleset | None = None) -> Result:
+        """
+        Filter class method to check text for links from Spam list.
+
+        :type text_to_check: ``NormalizedText``
+        :param text_to_check: Text to check.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to check with. The current one by default.
+
+        :return: Returns the result.
+        :rtype: ``Result``
+        """
+
+        trace("# Checking for links")
+        if text_to_check:
+            item = await self.spam_check(text_to_check.stripped, ruleset)
+            if item is not None:
+                msg = f"Forbidden '{item.replace('.', '[.]')}' from spam list was found."
+                trace("# {}", msg)
+                return Result(
+                    result=1,
+                    text=msg,
+                    case_description="подозрительная ссылка, реклама.",
+                )
+        else:
+            trace("# Text is None")
+        return Result()
+
+    @filter_log.catch
+    async def check_for_curses(self, text_to_check: NormalizedText, ruleset: CompiledRuleset | None = None) -> Result:
+        """
+        Filter class method to check text for Curses from according list.
+
+        :type text_to_check: ``NormalizedText``
+        :param text_to_check: Text to check.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to check with. The current one by default.
+
+        :return: Returns the result.
+        :rtype: ``Result``
+        """
+
+        if ruleset is None:
+            ruleset = self.ruleset
+        if text_to_check:
+            trace("# # Checking for curses")
+            trace("# Text after replacement: {}", text_to_check.folded)
+
+            tokens = await self.tokenize(text_to_check, ruleset)
+            discovered_words = await self.regex_check(
+                ruleset.regex_list,
+                text_to_check=text_to_check.folded,
+                list_name="regex_list",
+                skeleton=await self.fold_homoglyphs(text_to_check, ruleset),
+                screen=ruleset.regex_screen,
+                tokens=tokens,
+                matcher=ruleset.regex_tokens,
+                ruleset=ruleset,
+            )
+            discovered_words += await self.regex_check(
+                ruleset.curses_list,
+                text_to_check=text_to_check.folded,
+                list_name="curses_list",
+                tokens=tokens,
+                matcher=ruleset.curses_tokens,
+                ruleset=ruleset,
+            )
+
+            if discovered_words != []:
+                msg = f"Forbidden '{discovered_words}' from curses list was found."
+                trace("# {}", msg)
+                return Result(
+                    result=1,
+                    text=msg,
+                    case_description="нецензурные выражения.",
+                )
+        else:
+            trace("# Text is None")
+        return Result()
+
+    @filter_log.catch
+    async def check_for_mass_mailing(
+        self,
+        text_to_check: NormalizedText,
+        sender_id: int,
+        ruleset: CompiledRuleset | None = None,
+    ) -> Result:
+        """
+        Filter class method to check if near copies of the text were sent by different users recently.
+        The text is remembered for next checks.
+
+        :type text_to_check: ``NormalizedText``
+        :param text_to_check: Text to check.
+
+        :type sender_id: ``int``
+        :param sender_id: User ID.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to check with. The current one by default.
+
+        :return: Returns the result.
+        :rtype: ``Result``
+        """
+
+        if self.near_duplicates is None or not text_to_check:
+            return Result()
+        trace("# Checking for mass mailing")
+        # Copies with look-alike characters or other punctuation are the same text
+        skeleton = (ruleset or self.ruleset).folding.fold("".join(text_to_check.tokens))
+        senders = self.near_duplicates.add(skeleton, sender_id)
+        if senders >= Filter_config.near_duplicate_senders:
+            msg = f"Near copies of the message were sent by {senders} users in {Filter_config.near_duplicate_window} seconds."
+            trace("# {}", msg)
+            # Copies may be the same question of several members, so moderators decide
+            return Result(
+                result=2,
+                text=msg,
+                case_description="массовая рассылка, вероятно, спам.",
+            )
+        return Result()
+
+    @filter_log.catch
+    async def check_for_whitelist(self, text_to_check: str, ruleset: CompiledRuleset | None = None):
+        """
+        Filter class method to verify possible false cases of Curses check.
+
+        :type text_to_check: ``str``
+        :param text_to_check: Text to check.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to check with. The current one by default.
+
+        :return: Returns the result as boolean.
+        :rtype: ``bool``
+        """
+
+        trace("# Checking for whitelist: {}", text_to_check)
+        if text_to_check:
+            item = (ruleset or self.ruleset).whitelist.find(text_to_check)
+            if item is not None:
+                trace("# Whitelist '{}' was found in '{}', passing...", item, text_to_check)
+                return True
+        else:
+            trace("# Text is None")
+        trace("# No whitelist items found")
+        return False
+
+    @filter_log.catch
+    async def check_for_phone(self, text_to_check: NormalizedText):
+        """
+        Filter class method to check text for Phone numbers.
+
+        :type text_to_check: ``NormalizedText``
+        :param text_to_check: Text to check.
+
+        :return: Returns the result as Regex match group or None.
+        """
+
+        trace("# Checking for phones")
+        if text_to_check:
+            match = PHONE_PATTERN.search(text_to_check.folded)
+            if match:
+                return match.group()
+        else:
+            trace("# Text is None")
+        return None
+
+    @filter_log.catch
+    async def check_for_card(self, text_to_check: NormalizedText):
+        """
+        Filter class method to check text for Bank card numbers - 16 digits.
+
+        :type text_to_check: ``NormalizedText``
+        :param text_to_check: Text to check.
+
+        :return: Returns the result as Regex match group or None.
+        """
+
+        trace("# Checking for Bank cards")
+        if text_to_check:
+            match = CARD_PATTERN.search(text_to_check.folded)
+            if match:
+                return match.group()
+        else:
+            trace("# Text is None")
+        return None
+
+    @filter_log.catch
+    async def check_for_non_text(self, text_to_check: NormalizedText) -> bool:
+        """
+        Filter class method to check text consisting of emoji packs by Telegram prem.
+        Text is caught if it has more custom emoji than Telegram.emoji_length_limit, or if it is
+        emoji only, without letters and digits, and there are more emoji than the limit.
+
+        :type text_to_check: ``NormalizedText``
+        :param text_to_check: Text to check.
+
+        :return: Returns the result as boolean.
+        :rtype: ``bool``
+        """
+
+        trace("# Checking for emoji scam")
+        if text_to_check:
+            profile = text_to_check.profile
+            trace("# Text profile is {}", profile)
+            if profile.custom_emoji > Telegram.emoji_length_limit:
+                return True
+            if profile.letters + profile.digits == 0 and profile.emoji > Telegram.emoji_length_limit:
+                return True
+        else:
+            trace("# Text is None")
+        return False
+
+    @filter_log.catch
+    async def fold_homoglyphs(self, text_to_check: NormalizedText, ruleset: CompiledRuleset | None = None) -> str | None:
+        """
+        Filter class method to fold text to Cyrillic skeleton for regex_list and suspicious_regex.
+
+        :type text_to_check: ``NormalizedText``
+        :param text_to_check: Text to fold.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to check with. The current one by default.
+
+        :return: Returns folded text or None if rules are matched with character classes.
+        :rtype: ``str | None``
+        """
+
+        if self.match_mode == "classes":
+            return None
+        return (ruleset or self.ruleset).folding.fold(text_to_check.folded)
+
+    @filter_log.catch
+    async def tokenize(self, text_to_check: NormalizedText, ruleset: CompiledRuleset | None = None) -> list[str] | None:
+        """
+        Filter class method to split text to tokens for token-safe rules.
+
+        :type text_to_check: ``NormalizedText``
+        :param text_to_check: Text to split.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to check with. The current one by default.
+
+        :return: Returns tokens of folded text or None if rules are matched against the whole text.
+        :rtype: ``list[str] | None``
+        """
+
+        if self.match_mode != "tokens":
+            return None
+        return (ruleset or self.ruleset).token_pattern.findall(text_to_check.folded)
+
+    @filter_log.catch
+    async def regex_check(
+        self,
+        rules: tuple[CompiledRule, ...],
+        text_to_check: str,
+        skeleton: str | None = None,
+        screen: re.Pattern | None = None,
+        tokens: list[str] | None = None,
+        matcher: TokenMatcher | None = None,
+        ruleset: CompiledRuleset | None = None,
+        list_name: str = "",
+        counts: list[int] | None = None,
+    ) -> list[str]:
+        """
+        Filter class method to find words matching provided compiled rules.
+
+        :type rules: ``tuple[CompiledRule, ...]``
+        :param rules: Compiled rules from the ruleset.
+
+        :type text_to_check: ``str``
+        :param text_to_check: Text to check.
+
+        :type skeleton: ``str | None``
+        :param skeleton: Text folded to Cyrillic skeleton for the rules having skeleton pattern.
+
+        :type screen: ``re.Pattern | None``
+        :param screen: All skeleton patterns of the rules in one. If it finds nothing in the skeleton,
+            the rules having skeleton pattern are skipped.
+
+        :type tokens: ``list[str] | None``
+        :param tokens: Tokens of the text. If provided, token-safe rules are matched per token with the matcher.
+
+        :type matcher: ``TokenMatcher | None``
+        :param matcher: Token-safe rules of the list with remembered results for tokens.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset the rules come from, its whitelist is used. The current one by default.
+
+        :type list_name: ``str``
+        :param list_name: Words_DB list the rules come from, rule counters are kept under this name.
+
+        :type counts: ``list[int] | None``
+        :param counts: Count of found words which are not whitelisted is added here for every rule, by rule index.
+
+        :return: Returns found words which are not whitelisted.
+        :rtype: ``list[str]``
+        """
+
+        trace("# Checking with provided list")
+        list_counters = None
+        if self.rule_stats is not None and list_name:
+            list_counters = self.rule_stats.list_counters(list_name)
+            list_started = time.perf_counter_ns()
+        discovered_words = []
+        screened_out = skeleton is not None and screen is not None and screen.search(skeleton) is None
+        token_words = None
+        if tokens is not None and matcher is not None:
+            token_words = matcher.find(tokens)
+        for index, rule in enumerate(rules):
+            if trace.enabled:
+                trace("# Regex: {}", rule.source)
+            if token_words is not None and rule.token_safe:
+                # Whitelist is already checked for remembered words.
+                # Time of token matching belongs to the list, not to the rule.
+                words = token_words.get(index, ())
+                discovered_words.extend(words)
+                if counts is not None:
+                    counts[index] += len(words)
+                if list_counters is not None:
+                    counters = list_counters.rule(rule.source)
+                    counters.executions += 1
+                    counters.matches += bool(words)
+                continue
+            if list_counters is not None:
+                rule_started = time.perf_counter_ns()
+            screened = screened_out and rule.skeleton_pattern is not None
+            if screened:
+                matches = []
+            else:
+                matches = rule.find_words(text_to_check, skeleton)
+            if self.match_mode == "verify" and rule.skeleton_pattern is not None:
+                expected = rule.find_words(text_to_check)
+                if matches != expected:
+                    self.filter_log.warning(
+                        f"# Skeleton matches {matches} differ from {expected} for regex: {rule.source}"
+                    )
+                    matches = expected
+            if list_counters is not None:
+                counters = list_counters.rule(rule.source)
+                if screened:
+                    counters.screened += 1
+                else:
+                    counters.executions += 1
+                counters.time_ns += time.perf_counter_ns() - rule_started
+                counters.matches += bool(matches)
+            if matches:
+                trace("# Regex matches: {}", matches)
+                for match in matches:
+                    if not await self.check_for_whitelist(match, ruleset):
+                        discovered_words.append(match)
+                        if counts is not None:
+                            counts[index] += 1
+                        trace("# Regex results: {}", discovered_words)
+                    elif list_counters is not None:
+                        counters.whitelisted += 1
+        if list_counters is not None:
+            list_counters.executions += 1
+            list_counters.time_ns += time.perf_counter_ns() - list_started
+        return discovered_words
+
+    @filter_log.catch
+    async def spam_check(self, text_to_check: str, ruleset: CompiledRuleset | None = None) -> str | None:
+        """
+        Filter class method to find spam list item in the text.
+
+        :type text_to_check: ``str``
+        :param text_to_check: Stripped text to check.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to check with. The current one by default.
+
+        :return: Returns the item which comes first in the spam list among found ones, or None.
+        :rtype: ``str | None``
+        """
+
+        spam_list = (ruleset or self.ruleset).spam_list
+        if self.rule_stats is None:
+            return spam_list.first_match(text_to_check)
+        started = time.perf_counter_ns()
+        item = spam_list.first_match(text_to_check)
+        list_counters = self.rule_stats.list_counters("spam_list")
+        list_counters.executions += 1
+        list_counters.time_ns += time.perf_counter_ns() - started
+        if item is not None:
+            list_counters.rule(item).matches += 1
+        return item
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import operator
+import threading
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Hashable
+
+HASH_MASK = (1 << 64) - 1
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """Message seen by the index."""
+
+    signature: array
+    sender: Hashable
+    seen_at: float
+    bands: tuple[tuple[int, int], ...]
+
+
+class NearDuplicateIndex:
+    """
+    Rolling index of message signatures for mass mailing detection.
+
+    Every message is signed with MinHash of its character shingles, so copies with a few
+    changed characters share most of the signature. Signature is built with one permutation
+    hashing: every shingle is hashed once and goes to one of the bins, bin keeps the minimum.
+    Signatures are split into bands, and only messages sharing a band are compared (LSH).
+
+    The index keeps messages of the last window seconds, but not more than size of them.
+    Messages are evicted in arrival order, so memory stays the same under floods.
+    """
+
+    def __init__(
+        self,
+        window: float = 600.0,
+        size: int = 50000,
+        similarity: float = 0.6,
+        shingle_length: int = 3,
+        min_length: int = 30,
+        senders_limit: int = 5,
+        bins: int = 32,
+        band_size: int = 4,
+        scan_limit: int = 256,
+    ) -> None:
+        """
+        Build the index.
+
+        :type window: ``float``
+        :param window: Seconds a message is remembered.
+
+        :type size: ``int``
+        :param size: Max count of remembered messages.
+
+        :type similarity: ``float``
+        :param similarity: Min estimated Jaccard similarity of shingles for near copies.
+
+        :type shingle_length: ``int``
+        :param shingle_length: Length of character shingles.
+
+        :type min_length: ``int``
+        :param min_length: Shorter texts are not indexed, as short greetings are the same for everyone.
+            Never less than shingle_length.
+
+        :type senders_limit: ``int``
+        :param senders_limit: Count of senders to stop counting at.
+
+        :type bins: ``int``
+        :param bins: Signature length. Power of two.
+
+        :type band_size: ``int``
+        :param band_size: Bins in one band. Smaller bands find less similar copies and compare more.
+
+        :type scan_limit: ``int``
+        :param scan_limit: Max count of the latest messages compared in every band bucket.
+            Keeps lookups short when one text floods a bucket.
+        """
+
+        self.window = window
+        self.size = size
+        self.similarity = similarity
+        self.shingle_length = shingle_length
+        # Shorter texts have no shingles and nothing to fill the bins with
+        self.min_length = max(min_length, shingle_length)
+        self.senders_limit = senders_limit
+        self.bins = bins
+        self.bin_bits = bins.bit_length() - 1
+        self.band_size = band_size
+        self.scan_limit = scan_limit
+        self.entries: deque[Fingerprint] = deque()
+        self.buckets: dict[tuple[int, int], deque[Fingerprint]] = {}
+        self.lock = threading.Lock()
+
+    def signature(self, text: str) -> array | None:
+        """
+        MinHash signature of the text.
+
+        :type text: ``str``
+        :param text: Normalized text without spaces.
+
+        :return: Returns 16 bit minimums of the bins or None if the text is too short.
+        :rtype: ``array | None``
+        """
+
+        if len(text) < self.min_length:
+            return None
+        length = self.shingle_length
+        bin_mask = self.bins - 1
+        bin_bits = self.bin_bits
+        minimums = [HASH_MASK] * self.bins
+        for shingle in {text[position:position + length] for position in range(len(text) - length + 1)}:
+            value = hash(shingle) & HASH_MASK
+            index = value & bin_mask
+            value >>= bin_bits
+            if value < minimums[index]:
+                minimums[index] = value
+        # Empty bins borrow the next filled one, so two texts don't look alike by empty bins
+        for index in range(self.bins):
+            offset = 0
+            while minimums[(index + offset) % self.bins] == HASH_MASK:
+                offset += 1
+            if offset:
+                minimums[index] = minimums[(index + offset) % self.bins] + offset
+        return array("H", [value & 0xFFFF for value in minimums])
+
+    def add(self, text: str, sender: Hashable, now: float | None = None) -> int:
+        """
+        Remember the message and count its near copies.
+
+        :type text: ``str``
+        :param text: Normalized text without spaces.
+
+        :type sender: ``Hashable``
+        :param sender: Sender ID.
+
+        :type now: ``float | None``
+        :param now: Time of the message by time.monotonic. Current time by default.
+
+        :return: Returns count of different senders of near copies within the window,
+            including this message, but not more than senders_limit. 0 if the text is not indexed.
+        :rtype: ``int``
+        """
+
+        signature = self.signature(text)
+        if signature is None:
+            return 0
+        if now is None:
+            now = time.monotonic()
+        band_size = self.band_size
+        bands = tuple(
+            (start, hash(tuple(signature[start:start + band_size])))
+            for start in range(0, self.bins, band_size)
+        )
+        entry = Fingerprint(signature=signature, sender=sender, seen_at=now, bands=bands)
+        same_bins = self.similarity * self.bins
+        with self.lock:
+            self.evict(now - self.window)
+            senders = {sender}
+            for band in bands:
+                bucket = self.buckets.get(band)
+                if bucket is None:
+                    continue
+                for other in islice(reversed(bucket), self.scan_limit):
+                    if other.sender in senders:
+                        continue
+                    if sum(map(operator.eq, other.signature, signature)) >= same_bins:
+                        senders.add(other.sender)
+                        if len(senders) >= self.senders_limit:
+                            break
+                if len(senders) >= self.senders_limit:
+                    break
+            self.entries.append(entry)
+            for band in bands:
+                self.buckets.setdefault(band, deque()).append(entry)
+            if len(self.entries) > self.size:
+                self.pop_oldest()
+        return len(senders)
+
+    def evict(self, oldest: float) -> None:
+        """Forget messages seen before the oldest time."""
+        while self.entries and self.entries[0].seen_at < oldest:
+            self.pop_oldest()
+
+    def pop_oldest(self) -> None:
+        """Forget the oldest message. It is the oldest one in its buckets too."""
+        entry = self.entries.popleft()
+        for band in entry.bands:
+            bucket = self.buckets[band]
+            bucket.popleft()
+            if not bucket:
+                del self.buckets[band]
+
+    def __len__(self) -> int:
+        return len(self.entries)
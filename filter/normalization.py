@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import cached_property
+
+from filter.profile import CharProfile
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass(frozen=True)
+class NormalizedText:
+    """
+    Message text normalized once and shared by all Filter checks.
+
+    raw - text as it was received;
+    lowered - raw text in lower case;
+    folded - lowered text with replacements: ё -> е, \\n -> ' ';
+    stripped - folded text without spaces;
+    tokens - words of folded text;
+    custom_emoji - count of Telegram custom emoji entities of the message.
+    """
+
+    raw: str
+    lowered: str
+    folded: str
+    stripped: str
+    tokens: tuple[str, ...]
+    custom_emoji: int = 0
+
+    @classmethod
+    def from_text(cls, text: str | None, custom_emoji: int = 0) -> NormalizedText:
+        """
+        Build all forms of the text.
+
+        :type text: ``str | None``
+        :param text: Text to normalize. None is treated as empty text.
+
+        :type custom_emoji: ``int``
+        :param custom_emoji: Count of Telegram custom emoji entities of the message.
+
+        :return: Returns the normalized text.
+        :rtype: ``NormalizedText``
+        """
+
+        raw = text or ""
+        lowered = raw.lower()
+        folded = lowered.replace("ё", "е").replace("\n", " ")
+        return cls(
+            raw=raw,
+            lowered=lowered,
+            folded=folded,
+            stripped=folded.replace(" ", ""),
+            tokens=tuple(TOKEN_PATTERN.findall(folded)),
+            custom_emoji=custom_emoji,
+        )
+
+    @cached_property
+    def profile(self) -> CharProfile:
+        """Character classes of folded text, computed on first use and shared by all checks."""
+        return CharProfile.of(self.folded, self.custom_emoji)
+
+    def __bool__(self) -> bool:
+        return bool(self.raw)
+
+    def __str__(self) -> str:
+        return self.raw
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable
+
+from filter.normalization import NormalizedText
+
+
+class CheckContext:
+    """
+    Message under check and the facts several stages need.
+    Facts are computed by the first stage asking for them.
+    """
+
+    __slots__ = ("text", "username", "is_member", "ruleset", "text_is_latin", "username_is_latin")
+
+    def __init__(self, text: NormalizedText, username: NormalizedText, is_member: bool, ruleset: Any) -> None:
+        """
+        Build the context.
+
+        :type text: ``NormalizedText``
+        :param text: Text to check.
+
+        :type username: ``NormalizedText``
+        :param username: Username to check.
+
+        :type is_member: ``bool``
+        :param is_member: Is user member of the public.
+
+        :type ruleset: ``CompiledRuleset``
+        :param ruleset: Ruleset all stages check with, even if Filter gets a new one meanwhile.
+        """
+
+        self.text = text
+        self.username = username
+        self.is_member = is_member
+        self.ruleset = ruleset
+        self.text_is_latin: bool | None = None
+        self.username_is_latin: bool | None = None
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    Single check of the text.
+
+    name - stage name for logs;
+    check - coroutine function taking CheckContext and returning Result;
+    cost - relative cost, cheap stages go first;
+    verdicts - results the stage can return besides 0;
+    priority - rank of the suspicious verdict (2) of the stage, the lowest one is returned;
+    settles - suspicious verdict of the stage skips the rest of stages which can return suspicious verdict,
+    except other settling stages.
+    """
+
+    name: str
+    check: Callable[[CheckContext], Awaitable[Any]]
+    cost: int
+    verdicts: frozenset[int]
+    priority: int = 0
+    settles: bool = False
+
+    def can_decide(self) -> bool:
+        return 1 in self.verdicts
+
+    def only_decides(self) -> bool:
+        return self.verdicts == frozenset({1})
+
+
+class Pipeline:
+    """
+    Stages of Filter.check_text run until the verdict is settled.
+
+    Verdict 1 settles the check at once. Suspicious verdicts are kept, and the one with
+    the lowest priority is returned, so stages which can return only worse suspicious verdict
+    are skipped. Suspicious verdict of a settling stage skips other stages which can return
+    suspicious verdict, as bot heuristics have always stopped the check before suspicious words.
+
+    Orders:
+    "cost" - settling stages and stages which can return verdict 1 first, cheap stages first among them
+    and among the rest;
+    "compat" - stages in the order they are declared, the way check_text has always run them.
+    Both orders give the same result value, but description of verdict 1 may come from other stage
+    in "cost" order.
+    """
+
+    def __init__(self, stages: Iterable[Stage], order: str = "cost") -> None:
+        """
+        Build the pipeline.
+
+        :type stages: ``Iterable[Stage]``
+        :param stages: Stages in compatibility order.
+
+        :type order: ``str``
+        :param order: "cost" or "compat".
+        """
+
+        stages = tuple(stages)
+        if order == "cost":
+            # Verdict 1 makes the rest of stages needless, so stages which can return it go first.
+            # Settling stages go with them, as they decide whether other stages run at all.
+            # sorted is stable, so stages of the same cost keep compatibility order.
+            stages = tuple(sorted(stages, key=lambda stage: (not (stage.can_decide() or stage.settles), stage.cost)))
+        elif order != "compat":
+            raise ValueError(f"Unknown pipeline order: {order}")
+        self.order = order
+        self.stages = stages
+
+    async def run(self, context: CheckContext) -> Any | None:
+        """
+        Run the stages.
+
+        :type context: ``CheckContext``
+        :param context: Message to check.
+
+        :return: Returns the verdict or None if no stage has found anything.
+        :rtype: ``Result | None``
+        """
+
+        suspicious = None
+        suspicious_priority = 0
+        settled = False
+        for stage in self.stages:
+            if suspicious is not None and not stage.can_decide() and stage.priority >= suspicious_priority:
+                continue
+            if settled and not (stage.settles or stage.only_decides()):
+                continue
+            verdict = await stage.check(context)
+            if verdict is None or verdict.result == 0:
+                continue
+            if verdict.result == 1:
+                return verdict
+            if suspicious is None or stage.priority < suspicious_priority:
+                suspicious = verdict
+                suspicious_priority = stage.priority
+            settled = settled or stage.settles
+        return suspicious
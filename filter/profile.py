@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import unicodedata
+from dataclasses import dataclass
+
+# Classes of characters in the translated text
+LATIN = "l"
+CYRILLIC = "c"
+DIGIT = "d"
+EMOJI = "e"
+# Joiners, variation selectors, skin tones, keycaps and tags only change the emoji before them
+EMOJI_MODIFIER = "m"
+SPACE = "s"
+OTHER = "o"
+
+EMOJI_RANGES = (
+    (0x1F000, 0x1FAFF),  # Mahjong, cards, enclosed, pictographs, emoticons, transport, flags, symbols
+    (0x2600, 0x27BF),  # Miscellaneous symbols and dingbats
+    (0x2300, 0x23FF),  # Miscellaneous technical, like watch and hourglass
+    (0x2B00, 0x2BFF),  # Arrows and stars, like ⭐
+    (0x3030, 0x3030),
+    (0x303D, 0x303D),
+    (0x3297, 0x3297),
+    (0x3299, 0x3299),
+    (0x00A9, 0x00A9),
+    (0x00AE, 0x00AE),
+    (0x203C, 0x203C),
+    (0x2049, 0x2049),
+    (0x2122, 0x2122),
+    (0x2139, 0x2139),
+    (0x24C2, 0x24C2),
+)
+EMOJI_MODIFIER_RANGES = (
+    (0x200D, 0x200D),  # Zero width joiner
+    (0xFE0E, 0xFE0F),  # Variation selectors
+    (0x1F3FB, 0x1F3FF),  # Skin tones
+    (0x20E3, 0x20E3),  # Keycap
+    (0xE0020, 0xE007F),  # Tags of subdivision flags
+)
+
+
+def in_ranges(code: int, ranges: tuple[tuple[int, int], ...]) -> bool:
+    return any(start <= code <= end for start, end in ranges)
+
+
+class CharClasses(dict):
+    """
+    str.translate table mapping every character to its class letter.
+    Classes are computed on the first meeting of the character and kept, so the table
+    grows to the alphabet of the chats and then translation never leaves C code.
+    """
+
+    def __missing__(self, code: int) -> str:
+        char = chr(code)
+        if ("a" <= char <= "z") or ("A" <= char <= "Z"):
+            # Latin as check_for_english has always matched it: A-Z and a-z
+            char_class = LATIN
+        elif 0x0400 <= code <= 0x052F:
+            char_class = CYRILLIC if char.isalpha() else OTHER
+        elif unicodedata.category(char) == "Nd":
+            char_class = DIGIT
+        elif char.isspace():
+            char_class = SPACE
+        elif in_ranges(code, EMOJI_MODIFIER_RANGES):
+            char_class = EMOJI_MODIFIER
+        elif in_ranges(code, EMOJI_RANGES):
+            char_class = EMOJI
+        else:
+            char_class = OTHER
+        self[code] = char_class
+        return char_class
+
+
+CHAR_CLASSES = CharClasses()
+
+
+@dataclass(frozen=True, slots=True)
+class CharProfile:
+    """
+    Counts of character classes of the text, computed in one pass.
+
+    length - count of characters;
+    latin, cyrillic, digits, spaces, other - counts of these characters;
+    emoji - count of emoji, without modifiers of the emoji;
+    custom_emoji - count of Telegram custom emoji. They are shown instead of usual emoji characters,
+    so they are counted in emoji too;
+    first_latin - position of the first Latin letter, -1 if there is none.
+    """
+
+    length: int = 0
+    latin: int = 0
+    cyrillic: int = 0
+    digits: int = 0
+    emoji: int = 0
+    custom_emoji: int = 0
+    spaces: int = 0
+    other: int = 0
+    first_latin: int = -1
+
+    @classmethod
+    def of(cls, text: str, custom_emoji: int = 0) -> CharProfile:
+        """
+        Profile the text.
+
+        :type text: ``str``
+        :param text: Text to profile.
+
+        :type custom_emoji: ``int``
+        :param custom_emoji: Count of custom emoji entities of the message.
+
+        :return: Returns the profile.
+        :rtype: ``CharProfile``
+        """
+
+        classes = text.translate(CHAR_CLASSES)
+        return cls(
+            length=len(text),
+            latin=classes.count(LATIN),
+            cyrillic=classes.count(CYRILLIC),
+            digits=classes.count(DIGIT),
+            emoji=classes.count(EMOJI),
+            custom_emoji=custom_emoji,
+            spaces=classes.count(SPACE),
+            other=classes.count(OTHER),
+            first_latin=classes.find(LATIN),
+        )
+
+    @property
+    def visible(self) -> int:
+        """Count of characters besides spaces and emoji modifiers."""
+        return self.latin + self.cyrillic + self.digits + self.emoji + self.other
+
+    @property
+    def letters(self) -> int:
+        return self.latin + self.cyrillic
+
+    def ratio(self, count: int) -> float:
+        """Share of the count among visible characters."""
+        return count / self.visible if self.visible else 0.0
+
+    @property
+    def latin_ratio(self) -> float:
+        return self.ratio(self.latin)
+
+    @property
+    def cyrillic_ratio(self) -> float:
+        return self.ratio(self.cyrillic)
+
+    @property
+    def emoji_ratio(self) -> float:
+        return self.ratio(self.emoji)
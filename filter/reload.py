@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib
+import os
+import sys
+
+from loguru import logger
+
+from config.filter import Filter_config
+from config.words_db import Words_DB
+from filter.ruleset import CompiledRuleset
+
+
+def words_db_path() -> str:
+    """File Words_DB is defined in."""
+    return sys.modules[Words_DB.__module__].__file__
+
+
+def words_db_digest() -> str:
+    """
+    Hash of the file Words_DB is defined in.
+
+    :return: Returns hex digest.
+    :rtype: ``str``
+    """
+
+    with open(words_db_path(), "rb") as words_db_file:
+        return hashlib.sha256(words_db_file.read()).hexdigest()
+
+
+def reload_ruleset(match_mode: str = Filter_config.match_mode) -> CompiledRuleset:
+    """
+    Import Words_DB file once again and compile the ruleset from it.
+
+    :type match_mode: ``str``
+    :param match_mode: Filter match mode. Character class patterns are compiled now for "classes" and "verify".
+
+    :return: Returns the ruleset.
+    :rtype: ``CompiledRuleset``
+    """
+
+    words_db = importlib.reload(sys.modules[Words_DB.__module__]).Words_DB
+    ruleset = CompiledRuleset.from_words_db(words_db, token_memo_size=Filter_config.token_memo_size)
+    if match_mode in ("classes", "verify"):
+        ruleset.compile_patterns()
+    return ruleset
+
+
+class RulesetWatcher:
+    """
+    Watcher of the Words_DB file for Filter.
+    When the file is changed, new ruleset is compiled in a thread and swapped into the Filter.
+    Checks capture the ruleset once, so the ones in flight finish with the old ruleset.
+    """
+
+    def __init__(self, filter_instance: object, interval: float = Filter_config.reload_interval) -> None:
+        """
+        Build the watcher.
+
+        :type filter_instance: ``Filter``
+        :param filter_instance: Filter to swap the ruleset in.
+
+        :type interval: ``float``
+        :param interval: Seconds between checks of the file.
+        """
+
+        self.filter = filter_instance
+        self.interval = interval
+        self.path = words_db_path()
+        self.stamp = self.file_stamp()
+        self.digest = words_db_digest()
+
+    def file_stamp(self) -> tuple[int, int] | None:
+        """Modification time and size of the file, None if it can't be read."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def check(self) -> bool:
+        """
+        Reload the ruleset if the file is changed.
+
+        :return: Returns True if new ruleset is swapped into the Filter.
+        :rtype: ``bool``
+        """
+
+        stamp = self.file_stamp()
+        if stamp is None or stamp == self.stamp:
+            return False
+        self.stamp = stamp
+        try:
+            digest = await asyncio.to_thread(words_db_digest)
+            if digest == self.digest:
+                # The file is touched, but not changed
+                return False
+            ruleset = await asyncio.to_thread(reload_ruleset, self.filter.match_mode)
+        except Exception as error:
+            # Broken file is kept unnoticed until the next change, the old ruleset is in use
+            logger.error(f"# Can't reload Words_DB from {self.path}: {error}")
+            return False
+        self.digest = digest
+        if ruleset.version == self.filter.ruleset.version:
+            return False
+        self.filter.swap_ruleset(ruleset)
+        return True
+
+    async def run(self) -> None:
+        """Check the file every interval seconds, until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
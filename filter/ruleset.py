@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from functools import cached_property
+
+from config.words_db import Words_DB
+from filter.aho_corasick import AhoCorasick
+from filter.homoglyphs import WORD_PATTERN, HomoglyphFolding
+from filter.tokens import TokenMatcher
+from filter.whitelist import WhitelistMatcher
+
+# Regex syntax which can't make the rule match outside of one token
+TOKEN_SAFE_SYNTAX = frozenset(("(", ")", "(?:", "|", "?", "*", "+"))
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """
+    Single filter rule: its source from Words_DB and the compiled pattern.
+    Rules built from Words_DB.blacklists.abc also have the patterns for text folded to Cyrillic skeleton:
+    the rule itself and the rule surrounded by word characters. The first one is cheap and
+    gates the second one, as surrounding word characters can match nothing.
+    Token-safe rules match only characters they spell out, so they can be matched token by token.
+    """
+
+    source: str
+    skeleton_pattern: re.Pattern | None = None
+    skeleton_core: re.Pattern | None = None
+    token_safe: bool = False
+
+    @classmethod
+    def compile(cls, source: str, folding: HomoglyphFolding | None = None) -> CompiledRule:
+        """
+        Compile rule source the way Filter.regex_check has always matched it:
+        the rule itself surrounded by word characters.
+
+        :type source: ``str``
+        :param source: Regex or plain word from Words_DB.
+
+        :type folding: ``HomoglyphFolding | None``
+        :param folding: Folding to compile the skeleton pattern with. None for plain word lists.
+
+        :return: Returns the compiled rule.
+        :rtype: ``CompiledRule``
+        """
+
+        skeleton_pattern = None
+        skeleton_core = None
+        if folding is not None:
+            try:
+                folded_source = folding.fold_pattern(source)
+            except ValueError:
+                # The rule is matched with character classes only
+                pass
+            else:
+                skeleton_pattern = re.compile(f'\\w*{folded_source}\\w*', re.UNICODE)
+                skeleton_core = re.compile(folded_source, re.UNICODE)
+        rule = cls(
+            source=source,
+            skeleton_pattern=skeleton_pattern,
+            skeleton_core=skeleton_core,
+            token_safe=cls.is_token_safe(source, skeleton_core),
+        )
+        if skeleton_pattern is None:
+            # The only pattern of the rule, compile it now
+            rule.pattern
+        return rule
+
+    @cached_property
+    def pattern(self) -> re.Pattern:
+        """
+        The rule surrounded by word characters, with character classes as they are in Words_DB.
+        Compiling the wide classes is the most of ruleset build time, and rules having skeleton pattern
+        need it only in "classes" and "verify" match modes, so it is compiled on first use.
+        """
+        return re.compile(f'\\w*{self.source}\\w*', re.UNICODE)
+
+    @staticmethod
+    def is_token_safe(source: str, core: re.Pattern | None = None) -> bool:
+        """
+        Check if the rule matches only characters it spells out: the rule has characters,
+        character classes, groups, alternations and quantifiers only, and it can't match empty string.
+        Every match of such rule is inside one token of word characters and characters of the rule.
+
+        :type source: ``str``
+        :param source: Regex or plain word from Words_DB.
+
+        :type core: ``re.Pattern | None``
+        :param core: Folded rule, it matches empty string only if the rule does.
+
+        :return: Returns the result as boolean.
+        :rtype: ``bool``
+        """
+
+        try:
+            items = list(HomoglyphFolding.parse(source))
+        except ValueError:
+            return False
+        for kind, value in items:
+            if kind == "syntax" and value not in TOKEN_SAFE_SYNTAX and not value.startswith("{"):
+                return False
+        if core is None:
+            core = re.compile(source, re.UNICODE)
+        return core.fullmatch("") is None
+
+    def token_chars(self) -> set[str]:
+        """Characters besides word ones the token-safe rule can match."""
+        return {
+            char
+            for kind, value in HomoglyphFolding.parse(self.source) if kind != "syntax"
+            for char in value if not WORD_PATTERN.match(char)
+        }
+
+    def find_words(self, text: str, skeleton: str | None = None) -> list:
+        """
+        Find words matching the rule, like re.findall does.
+
+        :type text: ``str``
+        :param text: Folded text.
+
+        :type skeleton: ``str | None``
+        :param skeleton: The same text folded to Cyrillic skeleton. If provided and the rule
+            has the skeleton pattern, it is matched against the skeleton, and the words are
+            taken from the text at the same positions.
+
+        :return: Returns found words.
+        :rtype: ``list``
+        """
+
+        if skeleton is None or self.skeleton_pattern is None:
+            return self.pattern.findall(text)
+        if self.skeleton_core.search(skeleton) is None:
+            return []
+        pattern = self.skeleton_pattern
+        if pattern.groups == 0:
+            return [text[match.start():match.end()] for match in pattern.finditer(skeleton)]
+        words = []
+        for match in pattern.finditer(skeleton):
+            groups = tuple(
+                text[start:end] if start >= 0 else ""
+                for start, end in (match.span(group) for group in range(1, pattern.groups + 1))
+            )
+            words.append(groups[0] if pattern.groups == 1 else groups)
+        return words
+
+
+@dataclass(frozen=True)
+class CompiledRuleset:
+    """
+    Words_DB blacklists and whitelists compiled once per Filter.
+    Checks work with the pattern objects only and never touch the string form again.
+    Spam list is a literal substring list, so it is compiled into Aho-Corasick automaton.
+    """
+
+    regex_list: tuple[CompiledRule, ...]
+    curses_list: tuple[CompiledRule, ...]
+    suspicious_regex: tuple[CompiledRule, ...]
+    suspicious_list: tuple[CompiledRule, ...]
+    suspicious_points_limit: int
+    spam_list: AhoCorasick
+    whitelist: WhitelistMatcher
+    folding: HomoglyphFolding
+    # Skeleton rules of regex_list and suspicious_regex in one pattern. If it finds nothing,
+    # none of these rules can match the folded text.
+    regex_screen: re.Pattern | None
+    suspicious_screen: re.Pattern | None
+    # Token-safe rules of every list, for "tokens" match mode. Tokens are runs of word
+    # characters and other characters of these rules.
+    token_pattern: re.Pattern | None = None
+    regex_tokens: TokenMatcher | None = None
+    curses_tokens: TokenMatcher | None = None
+    suspicious_regex_tokens: TokenMatcher | None = None
+    suspicious_list_tokens: TokenMatcher | None = None
+    # Digest of Words_DB lists the ruleset is built from. Verdicts computed with
+    # other version are stale.
+    version: str = ""
+
+    @classmethod
+    def from_words_db(cls, words_db: type = Words_DB, token_memo_size: int = 65536) -> CompiledRuleset:
+        """
+        Build the ruleset from Words_DB lists.
+
+        :type words_db: ``type``
+        :param words_db: Words_DB class or any class with the same layout.
+
+        :type token_memo_size: ``int``
+        :param token_memo_size: Max count of words every list remembers found words for.
+
+        :return: Returns the compiled ruleset.
+        :rtype: ``CompiledRuleset``
+        """
+
+        blacklists = words_db.blacklists
+        folding = HomoglyphFolding(blacklists.abc, blacklists.regex_list + blacklists.suspicious_regex)
+        regex_list = tuple(CompiledRule.compile(item, folding) for item in blacklists.regex_list)
+        curses_list = tuple(CompiledRule.compile(item) for item in blacklists.curses_list)
+        suspicious_regex = tuple(CompiledRule.compile(item, folding) for item in blacklists.suspicious_regex)
+        suspicious_list = tuple(CompiledRule.compile(item) for item in blacklists.suspicious_list)
+        whitelist = WhitelistMatcher(words_db.whitelists.exclusions)
+        token_chars = set().union(*(
+            rule.token_chars()
+            for rule in regex_list + curses_list + suspicious_regex + suspicious_list if rule.token_safe
+        ))
+        return cls(
+            regex_list=regex_list,
+            curses_list=curses_list,
+            suspicious_regex=suspicious_regex,
+            suspicious_list=suspicious_list,
+            suspicious_points_limit=blacklists.suspicious_points_limit,
+            spam_list=AhoCorasick(blacklists.spam_list),
+            whitelist=whitelist,
+            folding=folding,
+            regex_screen=cls.compile_screen(regex_list),
+            suspicious_screen=cls.compile_screen(suspicious_regex),
+            version=cls.words_db_version(words_db),
+            token_pattern=re.compile(f"[\\w{''.join(re.escape(char) for char in sorted(token_chars))}]+", re.UNICODE),
+            regex_tokens=TokenMatcher(regex_list, whitelist, folding, token_memo_size),
+            curses_tokens=TokenMatcher(curses_list, whitelist, None, token_memo_size),
+            suspicious_regex_tokens=TokenMatcher(suspicious_regex, whitelist, folding, token_memo_size),
+            suspicious_list_tokens=TokenMatcher(suspicious_list, whitelist, None, token_memo_size),
+        )
+
+    @staticmethod
+    def words_db_version(words_db: type = Words_DB) -> str:
+        """
+        Digest of all Words_DB lists the ruleset is built from.
+
+        :type words_db: ``type``
+        :param words_db: Words_DB class or any class with the same layout.
+
+        :return: Returns hex digest.
+        :rtype: ``str``
+        """
+
+        blacklists = words_db.blacklists
+        lists = (
+            blacklists.abc,
+            blacklists.regex_list,
+            blacklists.curses_list,
+            blacklists.suspicious_regex,
+            blacklists.suspicious_list,
+            blacklists.suspicious_points_limit,
+            blacklists.spam_list,
+            words_db.whitelists.exclusions,
+        )
+        return hashlib.sha256(repr(lists).encode("utf-8", "surrogatepass")).hexdigest()
+
+    def token_matchers(self) -> tuple[TokenMatcher, ...]:
+        """Token matchers of all lists."""
+        return tuple(
+            matcher
+            for matcher in (self.regex_tokens, self.curses_tokens, self.suspicious_regex_tokens, self.suspicious_list_tokens)
+            if matcher is not None
+        )
+
+    def compile_patterns(self) -> None:
+        """Compile character class patterns of all rules now, not on the first message."""
+        for rule in self.regex_list + self.suspicious_regex:
+            rule.pattern
+
+    @staticmethod
+    def compile_screen(rules: tuple[CompiledRule, ...]) -> re.Pattern | None:
+        """
+        Join skeleton patterns of the rules into one alternation.
+
+        :type rules: ``tuple[CompiledRule, ...]``
+        :param rules: Compiled rules.
+
+        :return: Returns compiled alternation or None if no rule has skeleton pattern.
+        :rtype: ``re.Pattern | None``
+        """
+
+        cores = [f"(?:{rule.skeleton_core.pattern})" for rule in rules if rule.skeleton_core is not None]
+        if not cores:
+            return None
+        return re.compile("|".join(cores), re.UNICODE)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from typing import Iterable, Sequence
+
+from loguru import logger
+
+try:
+    import numpy as np
+except ImportError:
+    # Messages are scored one by one in pure Python
+    np = None
+
+# Sparse feature vector of the message: rule index and count of words the rule has found
+Features = tuple[tuple[int, int], ...]
+
+
+def load_weights(path: str) -> tuple[dict[str, float], float]:
+    """
+    Load rule weights tuned offline.
+
+    File is JSON: {"non_member": 1.0, "rules": {"<rule source>": 1.0, ...}}.
+    Rules missing in the file have weight 1.0.
+
+    :type path: ``str``
+    :param path: JSON file. Empty path gives weight 1.0 to every rule.
+
+    :return: Returns weights by rule source and weight of the sender not being a member.
+    :rtype: ``tuple[dict[str, float], float]``
+    """
+
+    if not path:
+        return {}, 1.0
+    with open(path, encoding="utf-8") as weights_file:
+        data = json.load(weights_file)
+    return {source: float(weight) for source, weight in data.get("rules", {}).items()}, float(data.get("non_member", 1.0))
+
+
+def save_weights(path: str, weights: dict[str, float], non_member: float = 1.0) -> None:
+    """
+    Save rule weights, see load_weights.
+
+    :type path: ``str``
+    :param path: JSON file.
+
+    :type weights: ``dict[str, float]``
+    :param weights: Weights by rule source.
+
+    :type non_member: ``float``
+    :param non_member: Weight of the sender not being a member.
+    """
+
+    with open(path, "w", encoding="utf-8") as weights_file:
+        json.dump({"non_member": non_member, "rules": weights}, weights_file, ensure_ascii=False, indent=2)
+
+
+class SuspiciousScorer:
+    """
+    Weighted score of suspicious words.
+
+    Every rule of suspicious_regex and suspicious_list has a weight. Message is a sparse vector
+    of words found by every rule, and its score is the dot product with the weights, plus the weight
+    of the sender not being a member. With all weights 1.0 the score is the count of suspicious points
+    check_for_suspicious_words has always used. Batch of messages is scored by one matrix-vector
+    product if NumPy is installed.
+    """
+
+    def __init__(self, ruleset: object, weights: dict[str, float] | None = None, non_member: float = 1.0) -> None:
+        """
+        Build the scorer.
+
+        :type ruleset: ``CompiledRuleset``
+        :param ruleset: Ruleset, features are indexes of suspicious_regex rules followed by suspicious_list ones.
+
+        :type weights: ``dict[str, float] | None``
+        :param weights: Weights by rule source. Missing rules have weight 1.0.
+
+        :type non_member: ``float``
+        :param non_member: Weight of the sender not being a member.
+        """
+
+        weights = weights or {}
+        self.version = ruleset.version
+        self.sources = tuple(rule.source for rule in ruleset.suspicious_regex + ruleset.suspicious_list)
+        self.weights = tuple(weights.get(source, 1.0) for source in self.sources)
+        self.non_member = non_member
+        self.vector = np.array(self.weights, dtype=np.float64) if np is not None else None
+
+    @staticmethod
+    def features(counts: Iterable[int]) -> Features:
+        """Sparse vector of the counts of found words by rule."""
+        return tuple((index, count) for index, count in enumerate(counts) if count)
+
+    def score(self, features: Features, is_member: bool = True) -> float:
+        """
+        Score of one message.
+
+        :type features: ``Features``
+        :param features: Sparse vector of the message.
+
+        :type is_member: ``bool``
+        :param is_member: Is user member of the public.
+
+        :return: Returns the score. Message without suspicious words has 0.
+        :rtype: ``float``
+        """
+
+        if not features:
+            return 0.0
+        weights = self.weights
+        score = sum(weights[index] * count for index, count in features)
+        if not is_member:
+            score += self.non_member
+        return score
+
+    def score_batch(self, batch: Sequence[tuple[Features, bool]]) -> list[float]:
+        """
+        Scores of many messages.
+
+        :type batch: ``Sequence[tuple[Features, bool]]``
+        :param batch: Sparse vector of every message and if its sender is a member.
+
+        :return: Returns scores in the order of the batch.
+        :rtype: ``list[float]``
+        """
+
+        if np is None or not batch:
+            return [self.score(features, is_member) for features, is_member in batch]
+        rows, columns, values = [], [], []
+        for row, (features, _) in enumerate(batch):
+            for index, count in features:
+                rows.append(row)
+                columns.append(index)
+                values.append(count)
+        matrix = np.zeros((len(batch), len(self.weights)), dtype=np.float64)
+        matrix[rows, columns] = values
+        scores = matrix @ self.vector
+        # Non member weight is added to messages with suspicious words only
+        extra = np.array(
+            [self.non_member if features and not is_member else 0.0 for features, is_member in batch],
+            dtype=np.float64,
+        )
+        return (scores + extra).tolist()
+
+
+async def main() -> None:
+    """Score labeled messages with the weights, to tune them offline."""
+    from config.filter import Filter_config
+    from filter.main import Filter
+    from filter.normalization import NormalizedText
+
+    parser = argparse.ArgumentParser(
+        prog="Suspicious words scoring",
+        description="This script scores labeled messages and shows how the weights separate spam",
+    )
+    parser.add_argument("path", help='JSON lines file: {"text": "...", "is_member": true, "label": 1}')
+    parser.add_argument(
+        "-w",
+        "--weights",
+        dest="weights_path",
+        default=Filter_config.suspicious_weights_path,
+        help="Weights JSON file",
+    )
+    parser.add_argument("-f", "--features", dest="features_path", help="Save features and labels as JSON lines")
+    args = parser.parse_args()
+
+    logger.remove()
+    filter_instance = await Filter.create(executor_workers=0, watch_rules=False, dump_rule_stats=False)
+    weights, non_member = load_weights(args.weights_path)
+    scorer = SuspiciousScorer(filter_instance.ruleset, weights, non_member)
+    limit = filter_instance.ruleset.suspicious_points_limit
+
+    with open(args.path, encoding="utf-8") as labeled_file:
+        labeled = [json.loads(line) for line in labeled_file if line.strip()]
+    batch = []
+    for item in labeled:
+        _, features = await filter_instance.find_suspicious_words(NormalizedText.from_text(item["text"]))
+        batch.append((features, item.get("is_member", True)))
+    scores = scorer.score_batch(batch)
+    await filter_instance.close()
+
+    if args.features_path:
+        with open(args.features_path, "w", encoding="utf-8") as features_file:
+            for item, (features, is_member) in zip(labeled, batch):
+                features_file.write(json.dumps({
+                    "features": {scorer.sources[index]: count for index, count in features},
+                    "is_member": is_member,
+                    "label": item.get("label"),
+                }, ensure_ascii=False) + "\n")
+
+    caught = [score >= limit for score in scores]
+    spam = [bool(item.get("label")) for item in labeled]
+    true_positive = sum(1 for found, label in zip(caught, spam) if found and label)
+    print(json.dumps({
+        "messages": len(labeled),
+        "limit": limit,
+        "caught": sum(caught),
+        "precision": round(true_positive / sum(caught), 4) if any(caught) else None,
+        "recall": round(true_positive / sum(spam), 4) if any(spam) else None,
+        "accuracy": round(sum(1 for found, label in zip(caught, spam) if found == label) / len(labeled), 4)
+        if labeled else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class RuleCounters:
+    """
+    Counters of one rule.
+
+    executions - checks the rule was matched in;
+    screened - checks the rule was skipped in, as the skeleton screen of the list had found nothing;
+    matches - checks the rule has found words in;
+    whitelisted - found words dropped by the whitelist;
+    time_ns - time of matching, without the whitelist.
+    """
+
+    executions: int = 0
+    screened: int = 0
+    matches: int = 0
+    whitelisted: int = 0
+    time_ns: int = 0
+
+
+@dataclass(slots=True)
+class ListCounters:
+    """
+    Counters of one Words_DB list and its rules.
+    Spam list is matched by one automaton, so only the list has executions and time,
+    and its rules have matches only.
+    """
+
+    executions: int = 0
+    time_ns: int = 0
+    rules: dict[str, RuleCounters] = field(default_factory=dict)
+
+    def rule(self, source: str) -> RuleCounters:
+        """Counters of the rule, created on first use."""
+        counters = self.rules.get(source)
+        if counters is None:
+            counters = self.rules[source] = RuleCounters()
+        return counters
+
+
+class RuleStats:
+    """
+    Per rule hit and timing counters of Filter checks.
+
+    Counters are plain integers updated on the event loop, so they cost a perf_counter_ns call
+    and a couple of additions per rule. Rules are keyed by their source, so counters survive
+    ruleset reload. Checks running in worker processes are counted by the workers.
+    """
+
+    def __init__(self) -> None:
+        self.lists: dict[str, ListCounters] = {}
+        self.started = time.time()
+
+    def list_counters(self, name: str) -> ListCounters:
+        """Counters of the list, created on first use."""
+        counters = self.lists.get(name)
+        if counters is None:
+            counters = self.lists[name] = ListCounters()
+        return counters
+
+    def reset(self) -> None:
+        """Drop all counters."""
+        self.lists = {}
+        self.started = time.time()
+
+    def snapshot(self, ruleset: Any = None, reset: bool = False) -> dict[str, Any]:
+        """
+        Copy of the counters, the most expensive rules first.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to list all rules of. Rules which were never run get zero counters,
+            so dead rules are in the snapshot too.
+
+        :type reset: ``bool``
+        :param reset: Drop the counters after the copy is taken.
+
+        :return: Returns counters of every list with its rules.
+        :rtype: ``dict[str, Any]``
+        """
+
+        sources: dict[str, tuple[str, ...]] = {}
+        if ruleset is not None:
+            sources = {
+                "regex_list": tuple(rule.source for rule in ruleset.regex_list),
+                "curses_list": tuple(rule.source for rule in ruleset.curses_list),
+                "suspicious_regex": tuple(rule.source for rule in ruleset.suspicious_regex),
+                "suspicious_list": tuple(rule.source for rule in ruleset.suspicious_list),
+                "spam_list": ruleset.spam_list.patterns,
+            }
+        lists = {}
+        for name in sorted(set(self.lists) | set(sources)):
+            counters = self.lists.get(name, ListCounters())
+            rules = {source: counters.rules.get(source, RuleCounters()) for source in sources.get(name, ())}
+            rules.update(counters.rules)
+            lists[name] = {
+                "executions": counters.executions,
+                "time_ns": counters.time_ns,
+                "rules": [
+                    {"source": source, **asdict(rule)}
+                    for source, rule in sorted(rules.items(), key=lambda item: (-item[1].time_ns, -item[1].matches))
+                ],
+            }
+        snapshot = {"started": self.started, "finished": time.time(), "lists": lists}
+        if reset:
+            self.reset()
+        return snapshot
+
+    def dump(self, path: str, ruleset: Any = None, reset: bool = False) -> None:
+        """
+        Save the snapshot as JSON. File is replaced at once.
+
+        :type path: ``str``
+        :param path: JSON file.
+
+        :type ruleset: ``CompiledRuleset | None``
+        :param ruleset: Ruleset to list all rules of.
+
+        :type reset: ``bool``
+        :param reset: Drop the counters after the copy is taken.
+        """
+
+        write_snapshot(path, self.snapshot(ruleset, reset))
+
+
+def write_snapshot(path: str, snapshot: dict[str, Any]) -> None:
+    """
+    Save the snapshot of counters as JSON. File is replaced at once.
+    Snapshot is a copy, so it can be written in another thread while counters go on.
+
+    :type path: ``str``
+    :param path: JSON file.
+
+    :type snapshot: ``dict[str, Any]``
+    :param snapshot: Snapshot taken by RuleStats.snapshot.
+    """
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as stats_file:
+        json.dump(snapshot, stats_file, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import threading
+from typing import Iterable
+
+from filter.homoglyphs import HomoglyphFolding
+from filter.whitelist import WhitelistMatcher
+
+
+class TokenMatcher:
+    """
+    Token-safe rules of one list matched per token of the text.
+
+    Rule is token-safe if it matches only characters it spells out (see CompiledRule.token_safe).
+    Tokens are runs of word characters and characters of token-safe rules, so every match of
+    such rule lies inside one token, and matching the tokens one by one finds the same.
+    Chat vocabulary is repetitive, so found words of every token are remembered for next messages.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable,
+        whitelist: WhitelistMatcher,
+        folding: HomoglyphFolding | None = None,
+        memo_size: int = 65536,
+    ) -> None:
+        """
+        Build the matcher.
+
+        :type rules: ``Iterable[CompiledRule]``
+        :param rules: Compiled rules of the list. Rules which are not token-safe are skipped.
+
+        :type whitelist: ``WhitelistMatcher``
+        :param whitelist: Whitelist to drop found words with.
+
+        :type folding: ``HomoglyphFolding | None``
+        :param folding: Folding the skeleton patterns of the rules were compiled with.
+
+        :type memo_size: ``int``
+        :param memo_size: Max count of remembered tokens.
+        """
+
+        self.rules = tuple((index, rule) for index, rule in enumerate(rules) if rule.token_safe)
+        self.whitelist = whitelist
+        self.folding = folding
+        self.memo_size = memo_size
+        self.memo: dict[str, tuple[tuple[int, tuple], ...]] = {}
+        self.lock = threading.Lock()
+
+    def match_token(self, token: str) -> tuple[tuple[int, tuple], ...]:
+        """
+        Match token-safe rules against the token.
+
+        :type token: ``str``
+        :param token: Token of folded text.
+
+        :return: Returns rule indexes and their found words, which are not whitelisted.
+        :rtype: ``tuple[tuple[int, tuple], ...]``
+        """
+
+        try:
+            return self.memo[token]
+        except KeyError:
+            pass
+        skeleton = self.folding.fold(token) if self.folding is not None else None
+        found = []
+        for index, rule in self.rules:
+            words = tuple(
+                word for word in rule.find_words(token, skeleton)
+                if not (word and self.whitelist.find(word) is not None)
+            )
+            if words:
+                found.append((index, words))
+        found = tuple(found)
+        with self.lock:
+            if len(self.memo) >= self.memo_size:
+                # Drop the oldest token
+                self.memo.pop(next(iter(self.memo)), None)
+            self.memo[token] = found
+        return found
+
+    def find(self, tokens: Iterable[str]) -> dict[int, list]:
+        """
+        Find words matching token-safe rules.
+
+        :type tokens: ``Iterable[str]``
+        :param tokens: Tokens of folded text in text order.
+
+        :return: Returns found words by rule index, in text order.
+        :rtype: ``dict[int, list]``
+        """
+
+        found: dict[int, list] = {}
+        for token in tokens:
+            for index, words in self.match_token(token):
+                found.setdefault(index, []).extend(words)
+        return found
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import threading
+from typing import Iterable
+
+from filter.aho_corasick import AhoCorasick
+
+
+class WhitelistMatcher:
+    """
+    All whitelist exclusions in one automaton.
+    Answers "is this word whitelisted" in one pass and remembers answers for words already seen.
+    """
+
+    def __init__(self, exclusions: Iterable[str], memo_size: int = 4096) -> None:
+        """
+        Build the matcher.
+
+        :type exclusions: ``Iterable[str]``
+        :param exclusions: Whitelist exclusions.
+
+        :type memo_size: ``int``
+        :param memo_size: Max count of remembered answers.
+        """
+
+        # Exclusions are word characters only, so old '\b\S*item\S*\b' search is
+        # the same as the plain substring search.
+        self.automaton = AhoCorasick(exclusions)
+        self.memo_size = memo_size
+        self.memo: dict[str, str | None] = {}
+        self.lock = threading.Lock()
+
+    def find(self, text: str) -> str | None:
+        """
+        Find the exclusion contained in the text.
+
+        :type text: ``str``
+        :param text: Found word or phrase to verify.
+
+        :return: Returns the exclusion or None if the text is not whitelisted.
+        :rtype: ``str | None``
+        """
+
+        try:
+            return self.memo[text]
+        except KeyError:
+            pass
+        item = self.automaton.first_match(text)
+        with self.lock:
+            if len(self.memo) >= self.memo_size:
+                # Drop the oldest answer
+                self.memo.pop(next(iter(self.memo)), None)
+            self.memo[text] = item
+        return item
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Iterable, Iterator
+
+from loguru import logger
+
+from filter import Filter, Result
+
+# Processing instance of the worker process, its source and the loop to run it on
+worker_processing = None
+worker_source = "vk"
+worker_loop: asyncio.AbstractEventLoop | None = None
+
+
+class RecordingFilter:
+    """
+    Filter for the replayed processing: checks run as usual, and their verdicts are remembered,
+    so the verdict of every update is known without looking at the actions.
+    """
+
+    def __init__(self, filter_instance: Filter) -> None:
+        self.filter = filter_instance
+        self.verdicts: list[Result] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.filter, name)
+
+    async def record(self, name: str, *args: Any, **kwargs: Any) -> Result:
+        verdict = await getattr(self.filter, name)(*args, **kwargs)
+        if verdict is not None:
+            self.verdicts.append(verdict)
+        return verdict
+
+    async def filter_response(self, *args: Any, **kwargs: Any) -> Result:
+        return await self.record("filter_response", *args, **kwargs)
+
+    async def check_text(self, *args: Any, **kwargs: Any) -> Result:
+        return await self.record("check_text", *args, **kwargs)
+
+    async def check_for_links(self, *args: Any, **kwargs: Any) -> Result:
+        return await self.record("check_for_links", *args, **kwargs)
+
+    async def check_for_mass_mailing(self, *args: Any, **kwargs: Any) -> Result:
+        return await self.record("check_for_mass_mailing", *args, **kwargs)
+
+    def take(self) -> Result:
+        """Verdict of the update: the first removal, else the first suspicious verdict. Forgets all verdicts."""
+        verdicts, self.verdicts = self.verdicts, []
+        for result in (1, 2):
+            for verdict in verdicts:
+                if verdict.result == result:
+                    return verdict
+        return Result()
+
+
+class StubActions:
+    """
+    Stub of VK API groups, messages and users and of Telegram bot.
+    Nothing is sent anywhere, actions are remembered by name.
+    """
+
+    def __init__(self) -> None:
+        self.actions: list[str] = []
+
+    def take(self) -> list[str]:
+        actions, self.actions = self.actions, []
+        return actions
+
+    async def is_member(self, user_id: int, group_id: int) -> dict:
+        return {"error": 0, "text": "1"}
+
+    async def get(self, user_id: int) -> dict:
+        return {"error": 0, "text": f"id{user_id}"}
+
+    async def delete(self, group_id: int, cm_id: int, peer_id: int) -> dict:
+        self.actions.append("delete")
+        return {"error": 0, "text": "Replay"}
+
+    async def send(self, text: str, group_id: int, peer_id: int) -> dict:
+        self.actions.append("send")
+        return {"error": 0, "text": "Replay"}
+
+    async def __call__(self, method: Any) -> bool:
+        # Telegram bot method, like DeleteMessage or RestrictChatMember
+        self.actions.append(type(method).__name__)
+        return True
+
+
+class MemoryDB:
+    """Telegram users DB kept in memory of the worker."""
+
+    def __init__(self) -> None:
+        self.violations: dict[int, int] = {}
+
+    async def add_user(self, user_id: int) -> None:
+        self.violations.setdefault(user_id, 0)
+
+    async def increase_violations(self, user_id: int) -> None:
+        self.violations[user_id] = self.violations.get(user_id, 0) + 1
+
+    async def get_user(self, user_id: int) -> SimpleNamespace | None:
+        if user_id not in self.violations:
+            return None
+        return SimpleNamespace(user_id=user_id, violations=self.violations[user_id])
+
+
+async def build_processing(source: str) -> Any:
+    """
+    Build VK or Telegram processing with the recording Filter and stubbed actions.
+
+    :type source: ``str``
+    :param source: "vk" or "tlg".
+
+    :return: Returns the processing instance.
+    """
+
+    filter_instance = RecordingFilter(
+        await Filter.create(executor_workers=0, watch_rules=False, dump_rule_stats=False)
+    )
+    actions = StubActions()
+    if source == "vk":
+        from vk.processing import VK_processing
+
+        processing = await VK_processing.create(
+            vk_proc_log=logger,
+            filter_instance=filter_instance,
+            vk_groups=actions,
+            vk_messages=actions,
+            vk_users=actions,
+            # Bad bots are not waited for, nothing is edited in the records
+            rechecks_enabled=False,
+        )
+    else:
+        from tlg.processing import TLG_processing
+
+        processing = await TLG_processing.create(
+            bot=actions,
+            tlg_proc_log=logger,
+            filter_instance=filter_instance,
+            db=MemoryDB(),
+        )
+    processing.actions = actions
+    return processing
+
+
+def init_worker(source: str, log_level: str) -> None:
+    """
+    Build the processing once per worker process.
+
+    :type source: ``str``
+    :param source: "vk" or "tlg".
+
+    :type log_level: ``str``
+    :param log_level: Level of processing logs printed to stderr.
+    """
+
+    global worker_processing, worker_source, worker_loop
+    logger.remove()
+    logger.add(sys.stderr, level=log_level, format="{time:YYYY-MM-DD HH:mm:ss} - {level} - {message}")
+    worker_source = source
+    worker_loop = asyncio.new_event_loop()
+    worker_processing = worker_loop.run_until_complete(build_processing(source))
+
+
+def replayed_event(processing: Any, event_type: str) -> dict:
+    """Verdict and actions of the update just processed."""
+    verdict = processing.filter.take()
+    return {
+        "type": event_type,
+        "result": verdict.result,
+        "text": verdict.text,
+        "case": verdict.case_description,
+        "actions": processing.actions.take(),
+    }
+
+
+async def replay_line(processing: Any, source: str, line: str) -> list[dict]:
+    """
+    Process one recorded line.
+
+    :type processing: ``VK_processing | TLG_processing``
+    :param processing: Processing built by build_processing.
+
+    :type source: ``str``
+    :param source: "vk" or "tlg".
+
+    :type line: ``str``
+    :param line: VK longpoll response or update, or Telegram Message or Update, as JSON.
+
+    :return: Returns verdict and actions of every processed update.
+    :rtype: ``list[dict]``
+    """
+
+    record = json.loads(line)
+    replayed = []
+    if source == "vk":
+        # Updates are processed one by one, not concurrently as the bot does, to know the verdict of each
+        handlers = processing.update_handlers
+        updates = [update for update in record.get("updates", [record]) if update.get("type") in handlers]
+        for update in updates:
+            await getattr(processing, handlers[update["type"]])(response={"updates": [update]})
+            replayed.append(replayed_event(processing, update["type"]))
+    else:
+        from aiogram.types import Message
+
+        await processing.moderate_event(Message.model_validate(record.get("message", record)))
+        replayed.append(replayed_event(processing, "message"))
+    return replayed
+
+
+def replay_chunk(first_line: int, lines: list[str]) -> list[dict]:
+    """
+    Process lines in the worker process.
+
+    :type first_line: ``int``
+    :param first_line: Number of the first line in the input.
+
+    :type lines: ``list[str]``
+    :param lines: Recorded lines.
+
+    :return: Returns verdict and actions of every processed update with its line number.
+    :rtype: ``list[dict]``
+    """
+
+    replayed = []
+    for number, line in enumerate(lines, first_line):
+        try:
+            events = worker_loop.run_until_complete(replay_line(worker_processing, worker_source, line))
+        except Exception as error:
+            events = [{"type": "error", "result": None, "text": str(error), "case": "", "actions": []}]
+        replayed.extend({"line": number, **event} for event in events)
+    return replayed
+
+
+def read_chunks(lines: Iterable[str], size: int) -> Iterator[tuple[int, list[str]]]:
+    """Split non empty lines into chunks, with the number of the first line of every chunk."""
+    chunk: list[str] = []
+    first_line = 1
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        if not chunk:
+            first_line = number
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield first_line, chunk
+            chunk = []
+    if chunk:
+        yield first_line, chunk
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="Moderator replay",
+        description="This script runs recorded VK longpoll updates or Telegram messages through the processing "
+        "with stubbed actions",
+    )
+    parser.add_argument("path", help="JSON lines file of recorded updates, '-' for stdin")
+    parser.add_argument("-s", "--source", dest="source", choices=["vk", "tlg"], default="vk", help="Bot of the records")
+    parser.add_argument("-o", "--output", dest="output", help="JSON lines file to write verdicts to")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        dest="workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Count of worker processes. Mass mailing is caught within one worker only.",
+    )
+    parser.add_argument("-c", "--chunk", dest="chunk", type=int, default=500, help="Lines per task of a worker")
+    parser.add_argument("-l", "--log-level", dest="log_level", default="WARNING", help="Level of processing logs")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO", format="{time:YYYY-MM-DD HH:mm:ss} - {level} - {message}")
+
+    verdicts: Counter = Counter()
+    cases: Counter = Counter()
+    actions: Counter = Counter()
+    events = 0
+    input_file = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8")
+    output_file = open(args.output, "w", encoding="utf-8") if args.output else None
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(args.source, args.log_level),
+    ) as pool:
+        # Bounded count of chunks in flight, so the input is streamed and verdicts keep input order
+        pending: deque[Future] = deque()
+
+        def collect(future: Future) -> None:
+            nonlocal events
+            for event in future.result():
+                events += 1
+                verdicts[str(event["result"])] += 1
+                if event["case"]:
+                    cases[event["case"]] += 1
+                actions.update(event["actions"])
+                if output_file is not None:
+                    output_file.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+        for first_line, chunk in read_chunks(input_file, args.chunk):
+            pending.append(pool.submit(replay_chunk, first_line, chunk))
+            if len(pending) >= args.workers * 2:
+                collect(pending.popleft())
+        while pending:
+            collect(pending.popleft())
+    seconds = time.perf_counter() - started
+    if input_file is not sys.stdin:
+        input_file.close()
+    if output_file is not None:
+        output_file.close()
+
+    print(json.dumps({
+        "events": events,
+        "seconds": round(seconds, 3),
+        "events_per_second": round(events / seconds, 1) if seconds else None,
+        "workers": args.workers,
+        "verdicts": dict(sorted(verdicts.items())),
+        "cases": dict(cases.most_common()),
+        "actions": dict(actions.most_common()),
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
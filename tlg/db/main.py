@@ -11,10 +11,13 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from config.logs import Logs
+from config.tlg import Telegram
+from tracing import get_tracer
 
 # DB settings
 CONNECTION_STRING = f"sqlite:////{Telegram.tlg_db_path}"
 Base = declarative_base()
+trace = get_tracer("tlg_db")
 
 
 class Users(Base):
@@ -75,19 +78,19 @@ class DB:
     @db_int_log.catch
     async def add_user(self, user_id: int) -> None:
         """Add user to DB"""
-        self.db_int_log.debug(f"# Add user {user_id} with 0 violations to DB")
+        trace("# Add user {} with 0 violations to DB", user_id)
         user_check = await self.get_user(user_id=user_id)
         if not user_check:
             new_user = Users(user_id=user_id, violations = 0)
             self.session.add(new_user)
             self.session.commit()
         else:
-            self.db_int_log.debug(f"# User {user_id} already exists in DB")
+            trace("# User {} already exists in DB", user_id)
 
     @db_int_log.catch
     async def update_user(self, user_id: int, violations: int) -> None:
         """Update user in DB"""
-        self.db_int_log.debug(f"# Update user {user_id}")
+        trace("# Update user {}", user_id)
         user_to_update = self.session.get(Users, user_id)
         if user_to_update:
             user_to_update.violations = violations
@@ -96,19 +99,19 @@ class DB:
     @db_int_log.catch
     async def get_user(self, user_id: int) -> Users | None:
         """Get user from DB"""
-        self.db_int_log.debug(f"# Get user {user_id} from DB")
+        trace("# Get user {} from DB", user_id)
         # user_check = self.session.query(Users).filter_by(user_id = user_id)
         user_check = self.session.get(Users, user_id)
         if user_check:
-            self.db_int_log.debug(f"# DB data: {user_check}")
+            trace("# DB data: {}", user_check)
             return user_check
-        self.db_int_log.debug("# No such user")
+        trace("# No such user")
         return None
 
     @db_int_log.catch
     async def remove_user(self, user_id: int) -> None:
         """Remove user from DB"""
-        self.db_int_log.debug(f"# Remove user {user_id} from DB")
+        trace("# Remove user {} from DB", user_id)
         user_check = await self.get_user(user_id=user_id)
         if user_check:
             removed_user = self.session.get(Users, user_id)
@@ -118,7 +121,7 @@ class DB:
     @db_int_log.catch
     async def increase_violations(self, user_id: int) -> None:
         """Increase user violations to 1"""
-        self.db_int_log.debug(f"# Increase user {user_id} violations")
+        trace("# Increase user {} violations", user_id)
         user_check = await self.get_user(user_id=user_id)
         if user_check:
             await self.update_user(user_id=user_id, violations=user_check.violations + 1)
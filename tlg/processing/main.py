@@ -10,14 +10,23 @@ from loguru import logger as tlg_proc_log
 from datetime import timedelta
 
 from config.logs import Logs
-from filter import Filter
+from filter import Filter, NormalizedText
 from tlg.db.main import DB
+from tracing import get_tracer
 
+trace = get_tracer("tlg_processing")
 
 class TLG_processing:
     # To avoid async __init__
     @classmethod
-    async def create(cls, bot: Bot, tlg_proc_log: logger = tlg_proc_log, debug_enabled: bool = False) -> None:  # type: ignore
+    async def create(
+        cls,
+        bot: Bot,
+        tlg_proc_log: logger = tlg_proc_log,  # type: ignore
+        debug_enabled: bool = False,
+        filter_instance: Filter | None = None,
+        db: DB | None = None,
+    ) -> None:
         """
         Telegram Processing class init
 
@@ -27,6 +36,12 @@ class TLG_processing:
         :type debug_enabled: ``bool``
         :param debug_enabled: Boolean to switch on and off debugging. False by default.
 
+        :type filter_instance: ``Filter | None``
+        :param filter_instance: Filter to check with. New one is created by default.
+
+        :type db: ``DB | None``
+        :param db: Users database. New connection is created by default.
+
         :return: Returns the class instance.
         """
 
@@ -52,8 +67,8 @@ class TLG_processing:
             self.tlg_proc_log = tlg_proc_log
         else:
             self.tlg_proc_log = tlg_proc_log
-        self.filter = await Filter.create(debug_enabled=debug_enabled)
-        self.db = await DB.create(debug_enabled=debug_enabled)
+        self.filter = filter_instance if filter_instance is not None else await Filter.create(debug_enabled=debug_enabled)
+        self.db = db if db is not None else await DB.create(debug_enabled=debug_enabled)
 
         # Result=0 - false
         # Result=1 - true
@@ -61,6 +76,10 @@ class TLG_processing:
         self.result = {"result": 0, "text": "", "case": ""}
         return self
 
+    async def close(self) -> None:
+        """Processing class method to close the Filter."""
+        await self.filter.close()
+
     @tlg_proc_log.catch
     async def mute_user(self, event, result, text) -> None:
         """Mute user and notify"""
@@ -87,13 +106,13 @@ class TLG_processing:
             # Compose message for notification
             div = "-----------------------------"
             msg_main = f"# Message to remove from {event.from_user.first_name}:\n# '{text.replace('.', '[.]').replace(':', '[:]')}'."
-            words = result["text"]
-            case = f"# Case: {result['case']}"
+            words = result.text
+            case = f"# Case: {result.case_description}"
             msg = f"{msg_main}\n{div}\n# {words}\n{div}\n{case}"
             tlg_proc_log.info(msg)
             await self.bot(SendMessage(
                 chat_id=event.chat.id,
-                text=f"Предупреждение {event.from_user.first_name} за нарушение: {result['case']}\nНарушений: {user.violations}.\nОтправка сообщений ограничена на {user.violations} час(а)",
+                text=f"Предупреждение {event.from_user.first_name} за нарушение: {result.case_description}\nНарушений: {user.violations}.\nОтправка сообщений ограничена на {user.violations} час(а)",
             ))
 
     @tlg_proc_log.catch
@@ -104,31 +123,55 @@ class TLG_processing:
 
         check_url_result = None
         for url in urls:
-            check_url_result = await self.filter.check_for_links(url)
-            tlg_proc_log.debug(f"# Filter result: {check_url_result}")
+            check_url_result = await self.filter.check_for_links(NormalizedText.from_text(url))
+            trace("# Filter result: {}", check_url_result)
 
         if check_url_result:
-            if check_url_result["result"] == 1:
-                await self.mute_user(event=event, result=check_url_result["text"])
-
-        tlg_proc_log.debug(
-            f"# Text: {event.text or None}, "
-            f"Caption: {event.caption or None}, "
-            f"Name: {event.from_user.first_name}, "
-            f"Login: {event.from_user.username}, "
-            f"URLS: {urls}, "
-            f"Chat ID: {event.chat.id}, "
-            f"Event ID: {event.message_id}"
+            if check_url_result.result == 1:
+                await self.mute_user(event=event, result=check_url_result, text=event.text or event.caption or "")
+
+        trace(
+            "# Text: {}, Caption: {}, Name: {}, Login: {}, URLS: {}, Chat ID: {}, Event ID: {}",
+            event.text or None,
+            event.caption or None,
+            event.from_user.first_name,
+            event.from_user.username,
+            urls,
+            event.chat.id,
+            event.message_id,
         )
 
         check_text_result = None
         text = event.text or event.caption
         if text:
-            check_text_result = await self.filter.check_text(text, event.from_user.username)
+            # Premium emoji packs are drawn with custom emoji entities over usual emoji
+            entities = event.entities or event.caption_entities or []
+            custom_emoji = sum(1 for entity in entities if entity.type == "custom_emoji")
+            normalized_text = NormalizedText.from_text(text, custom_emoji)
+            # Through the verdict cache: raids send the same text from many accounts.
+            # No attachments here, so it is the verdict of check_text.
+            check_text_result = await self.filter.filter_response(
+                normalized_text,
+                event.from_user.username,
+                [],
+                True,
+            )
+            # Every message goes to near duplicates index, even the one to remove
+            mass_mailing_result = await self.filter.check_for_mass_mailing(
+                normalized_text,
+                event.from_user.id,
+            )
+            removed = check_text_result is not None and check_text_result.result == 1
+            if mass_mailing_result and mass_mailing_result.result == 2 and not removed:
+                # Message is not removed, moderators are notified
+                div = "-----------------------------"
+                msg_main = f"# Suspicious message from {event.from_user.first_name}:\n# '{text.replace('.', '[.]').replace(':', '[:]')}'"
+                case = f"# Case: {mass_mailing_result.case_description}"
+                tlg_proc_log.info(f"{msg_main}\n{div}\n# {mass_mailing_result.text}\n{div}\n{case}")
 
         if check_text_result:
-            tlg_proc_log.debug(f"# Filter result: {check_text_result}")
-            if check_text_result["result"] == 1:
+            trace("# Filter result: {}", check_text_result)
+            if check_text_result.result == 1:
                 await self.mute_user(event=event, result=check_text_result, text=text)
         else:
-            tlg_proc_log.debug("# No check text result.")
+            trace("# No check text result.")
@@ -24,6 +24,9 @@ from datetime import timedelta
 from config.tlg import Telegram
 from tlg.processing import TLG_processing
 from tlg.db import DB
+import tracing
+
+trace = tracing.get_tracer("tlg_processing")
 
 
 class captchaDialog(StatesGroup):
@@ -45,11 +48,15 @@ class ModeratorBot:
         self.tlg_proc = await TLG_processing.create(bot=self.bot, debug_enabled=self.args.debug_enabled)
         self.db = await DB.create()
         logger.info("Telegram moderator bot re/starting..")
-        await self.dp.start_polling(self.bot)
+        try:
+            await self.dp.start_polling(self.bot)
+        finally:
+            # Polling returns on shutdown signals, Filter saves what it has remembered
+            await self.tlg_proc.close()
 
     async def greet_new_user(self, event: types.ChatMemberUpdated, state: FSMContext):
-        logger.debug("# Greet chat member ========================================"[:70])
-        logger.debug(f"# Event: {event}")
+        trace("# Greet chat member ========================================"[:70])
+        trace("# Event: {}", event)
         logger.info(f"# Joining username: {event.new_chat_member.user.first_name}, user ID: {event.new_chat_member.user.id}")
         if Telegram.Captcha.Enabled:
             await self.handle_captcha(event, state)
@@ -63,7 +70,7 @@ class ModeratorBot:
             callback_data="yes"
         ))
         self.user_id = event.new_chat_member.user.id
-        logger.debug(f"# New user {event.new_chat_member.user.first_name} was muted until answered to captcha")
+        trace("# New user {} was muted until answered to captcha", event.new_chat_member.user.first_name)
         try:
             await self.bot.restrict_chat_member(
                 chat_id=event.chat.id,
@@ -80,7 +87,7 @@ class ModeratorBot:
                                reply_markup=builder.as_markup())
         except AiogramError as e:
             logger.error(f"# Something went wrong: {e}")
-        logger.debug("# Waiting for new user input...")
+        trace("# Waiting for new user input...")
         await state.set_state(captchaDialog.user_answering)
         await asyncio.sleep(Telegram.Captcha.Timeout)
         user_state = await state.get_state()
@@ -104,8 +111,8 @@ class ModeratorBot:
                 logger.error(f"# Something went wrong: {e}")
 
     async def announce_user_leave(self, event: types.ChatMemberUpdated):
-        logger.debug("# Chat member leave ========================================"[:70])
-        logger.debug(f"# Event: {event}")
+        trace("# Chat member leave ========================================"[:70])
+        trace("# Event: {}", event)
         logger.info(f"# Leaving username: {event.old_chat_member.user.first_name}, user ID: {event.old_chat_member.user.id}")
         if self.is_supergroup(event):
             try:
@@ -119,8 +126,8 @@ class ModeratorBot:
     async def announce_user_mute(self, event: types.ChatMemberUpdated):
         if self.user_id == event.old_chat_member.user.id:
             return
-        logger.debug("# Chat member muted ========================================"[:70])
-        logger.debug(f"# Event: {event}")
+        trace("# Chat member muted ========================================"[:70])
+        trace("# Event: {}", event)
         try:
             await self.bot(SendMessage(
                 chat_id=event.chat.id,
@@ -129,8 +136,8 @@ class ModeratorBot:
             logger.error(f"# Something went wrong: {e}")
 
     async def announce_user_unmute(self, event: types.ChatMemberUpdated):
-        logger.debug("# Chat member unmuted ========================================"[:70])
-        logger.debug(f"# Event: {event}")
+        trace("# Chat member unmuted ========================================"[:70])
+        trace("# Event: {}", event)
         try:
             await self.bot(SendMessage(
                 chat_id=event.chat.id,
@@ -139,8 +146,8 @@ class ModeratorBot:
             logger.error(f"# Something went wrong: {e}")
 
     async def announce_user_ban(self, event: types.ChatMemberUpdated):
-        logger.debug("# Chat member banned ========================================"[:70])
-        logger.debug(f"# Event: {event}")
+        trace("# Chat member banned ========================================"[:70])
+        trace("# Event: {}", event)
         if event.old_chat_member.user.first_name != '':
             await self.db.remove_user(user_id=event.from_user.id)
             try:
@@ -151,25 +158,25 @@ class ModeratorBot:
                 logger.error(f"# Something went wrong: {e}")
 
     async def moderate_user_message(self, event: types.Message):
-        logger.debug("# New/edited message ========================================"[:70])
-        logger.debug(f"# Event: {event}")
-        logger.debug(f"# Username: {event.from_user.first_name}, user ID: {event.from_user.id}, text: {event.text}")
+        trace("# New/edited message ========================================"[:70])
+        trace("# Event: {}", event)
+        trace("# Username: {}, user ID: {}, text: {}", event.from_user.first_name, event.from_user.id, event.text)
         if not self.args.moderate_admins_enabled:
-            logger.debug("# Skip admin messages")
+            trace("# Skip admin messages")
             admins_list = await self.get_chat_administrators(chat_id=event.chat.id)
             if admins_list and event.from_user.id in admins_list:
-                logger.debug("# Wouldn't moderate this message")
+                trace("# Wouldn't moderate this message")
                 return
         if event.from_user.id == 777000:
-            logger.debug("# Skip Telegram messages")
+            trace("# Skip Telegram messages")
             return
         if event.from_user.id == self.user_id and event.text is None:
-            logger.debug(f"# This is empty message about new user join. Message ID: {event.message_id}")
+            trace("# This is empty message about new user join. Message ID: {}", event.message_id)
             self.message_id = event.message_id
         await self.tlg_proc.moderate_event(event)
 
     async def get_chat_administrators(self, chat_id: int) -> list:
-        logger.debug("# Get chat administrators ========================================"[:70])
+        trace("# Get chat administrators ========================================"[:70])
         admins_list = []
         admins = await self.bot(GetChatAdministrators(chat_id=chat_id))
         for admin in admins:
@@ -177,7 +184,7 @@ class ModeratorBot:
         return admins_list if admins_list else None
 
     def is_supergroup(self, event) -> bool:
-        logger.debug("# Check if user join/leave supergroup ========================================"[:70])
+        trace("# Check if user join/leave supergroup ========================================"[:70])
         if event.chat.type == "supergroup":
             return True
         return False
@@ -236,6 +243,7 @@ async def main() -> None:
         }
         tg_handler = NotificationHandler("telegram", defaults=tg_params)
         logger.add(tg_handler, format="{message}", level="INFO")
+    tracing.configure(args.debug_enabled)
 
     bot = Bot(token=Telegram.tlg_api.api_key, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
     dp = Dispatcher(storage=MemoryStorage(), fsm_strategy=FSMStrategy.CHAT)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from loguru import logger
+
+from config.logs import Logs
+
+
+class Tracer:
+    """
+    Debug tracing of one subsystem, like "filter" or "vk_api".
+
+    Switched off tracer returns at once, so messages are never formatted: pass the message
+    with "{}" placeholders and its arguments, not an f-string. Arguments costly to compute go
+    to lazy() as functions. Hot loops check tracer.enabled before the call.
+    Tracers are switched on by configure() in debug mode, see Logs.trace_* switches.
+    """
+
+    __slots__ = ("subsystem", "enabled")
+
+    def __init__(self, subsystem: str) -> None:
+        """
+        Build the tracer, switched off.
+
+        :type subsystem: ``str``
+        :param subsystem: Subsystem name, Logs.trace_<subsystem> switches it.
+        """
+
+        self.subsystem = subsystem
+        self.enabled = False
+
+    def __call__(self, message: str, *args: Any, **kwargs: Any) -> None:
+        """
+        Log debug message, formatted with the arguments only if the tracer is on.
+
+        :type message: ``str``
+        :param message: Message, with "{}" placeholders if there are arguments.
+        """
+
+        if self.enabled:
+            logger.opt(depth=1).debug(message, *args, **kwargs)
+
+    def lazy(self, message: str, *args: Callable[[], Any], **kwargs: Callable[[], Any]) -> None:
+        """
+        Log debug message, arguments are functions called only if the tracer is on.
+
+        :type message: ``str``
+        :param message: Message with "{}" placeholders.
+        """
+
+        if self.enabled:
+            logger.opt(depth=1, lazy=True).debug(message, *args, **kwargs)
+
+
+# Tracers of all subsystems, they are shared by the modules
+tracers: dict[str, Tracer] = {}
+configured_debug = False
+
+
+def get_tracer(subsystem: str) -> Tracer:
+    """
+    Tracer of the subsystem. Modules get it once on import, configure() switches it later.
+
+    :type subsystem: ``str``
+    :param subsystem: Subsystem name.
+
+    :return: Returns the tracer.
+    :rtype: ``Tracer``
+    """
+
+    tracer = tracers.get(subsystem)
+    if tracer is None:
+        tracer = tracers[subsystem] = Tracer(subsystem)
+        tracer.enabled = configured_debug and getattr(Logs, f"trace_{subsystem}", True)
+    return tracer
+
+
+def configure(debug_enabled: bool) -> None:
+    """
+    Switch tracers on in debug mode, the ones Logs.trace_* switches allow.
+    Bots call it once the loggers are set up.
+
+    :type debug_enabled: ``bool``
+    :param debug_enabled: Is the bot started in debug mode.
+    """
+
+    global configured_debug
+    configured_debug = debug_enabled
+    for subsystem, tracer in tracers.items():
+        tracer.enabled = debug_enabled and getattr(Logs, f"trace_{subsystem}", True)
@@ -5,7 +5,9 @@ from __future__ import annotations
 from vk.api.groups import Groups
 from vk.api import vk_api_log, VK_API
 from config.vk import VK_config
+from tracing import get_tracer
 
+trace = get_tracer("longpoll")
 
 class Longpoll(Groups, VK_API):
     # To avoid async __init__
@@ -31,11 +33,11 @@ class Longpoll(Groups, VK_API):
         }
         # self.vk_groups = Groups()
         # Get Longpoll server parameters
-        vk_api_log.debug("# Get LongPoll server parameters to listen")
+        trace("# Get LongPoll server parameters to listen")
         get_server_result = await self.get_long_poll_server()
         if get_server_result:
             if get_server_result["error"] != 1:
-                vk_api_log.debug(f"# {get_server_result['text']}")
+                trace("# {}", get_server_result['text'])
             else:
                 vk_api_log.error(
                     f"# Get Longpoll server parameters error. {get_server_result['text']}",
@@ -66,6 +68,8 @@ class Longpoll(Groups, VK_API):
             self.server,
             params=payload,
             use_ssl=self.use_ssl,
+            # VK holds the request up to wait seconds, so the usual timeout is too short
+            timeout=VK_config.Longpoll.wait + VK_config.HTTP.longpoll_timeout_margin,
         )
         return response
 
@@ -79,12 +83,12 @@ class Longpoll(Groups, VK_API):
         :rtype: ``dict``
         """
 
-        vk_api_log.debug("# Starting to listen LongPoll API.")
+        trace("# Starting to listen LongPoll API.")
         response = await self.listen_longpoll()
 
         # If there are errors in VK Longpoll response - process it
         # Else - process response
-        vk_api_log.debug(f"# Longpoll API response: {response}")
+        trace("# Longpoll API response: {}", response)
         if not response:
             vk_api_log.error("# Longpoll response is empty!")
             self.result['type'] = "error"
@@ -105,28 +109,26 @@ class Longpoll(Groups, VK_API):
                     self.result['type'] = "error"
                     return self.result
             else:
-                vk_api_log.debug("# No failures in response.")
+                trace("# No failures in response.")
                 if response["updates"] == []:
-                    vk_api_log.debug("# Listening interval passed, nothing new.")
+                    trace("# Listening interval passed, nothing new.")
                     self.result['type'] = "pass"
                     return self.result
                 self.ts = response["ts"]
 
-                if (
-                    response["updates"][0]["type"] == "wall_reply_new"
-                    or response["updates"][0]["type"] == "wall_reply_edit"
-                    or response["updates"][0]["type"] == "photo_comment_new"
-                    or response["updates"][0]["type"] == "photo_comment_edit"
-                ):
-                    self.result['text'] = response
-                    self.result['type'] = "comment"
-                    return self.result
-
-                # If this is new error
-                if response["updates"][0]["type"] == "error_new":
+                # Every update of the batch goes to processing, errors are only logged
+                updates = []
+                for update in response["updates"]:
+                    if update.get("type") == "error_new":
+                        vk_api_log.error(f"# Error update in LP response: {update}")
+                    else:
+                        updates.append(update)
+                if not updates:
                     self.result['text'] = response
                     self.result['type'] = "error"
                     return self.result
+                self.result['text'] = updates
+                self.result['type'] = "updates"
                 return self.result
 
     @vk_api_log.catch
@@ -141,7 +143,7 @@ class Longpoll(Groups, VK_API):
         :rtype: ``dict``
         """
 
-        vk_api_log.debug(f"# Processing Longpoll error: {result}")
+        trace("# Processing Longpoll error: {}", result)
         if result["failed"] == 1:
             self.result["text"] = (
                 f"[VK WARNING] Event history is deprecated or lost. New TS provided: {result['ts']}."
@@ -2,13 +2,55 @@
 # Reviewed: July 25, 2025
 from __future__ import annotations
 
+import asyncio
 import json
-import requests
 
+import aiohttp
 from loguru import logger
 from loguru import logger as vk_api_log
 
 from config.vk import VK_config
+from tracing import get_tracer
+
+trace = get_tracer("vk_api")
+
+# HTTP session shared by all VK API classes, its connections are kept alive between requests
+http_session: aiohttp.ClientSession | None = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Shared HTTP session, created on first use in the running event loop.
+
+    :return: Returns the session.
+    :rtype: ``aiohttp.ClientSession``
+    """
+
+    global http_session
+    if http_session is None or http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=VK_config.HTTP.limit,
+            limit_per_host=VK_config.HTTP.limit_per_host,
+            keepalive_timeout=VK_config.HTTP.keepalive_timeout,
+            ttl_dns_cache=VK_config.HTTP.dns_cache_ttl,
+        )
+        http_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=VK_config.HTTP.total_timeout,
+                connect=VK_config.HTTP.connect_timeout,
+            ),
+        )
+        trace("# HTTP session is created")
+    return http_session
+
+
+async def close_session() -> None:
+    """Close the shared HTTP session and its connections. Bot calls it on shutdown."""
+    global http_session
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+    http_session = None
 
 
 class VK_API:
@@ -60,11 +102,13 @@ class VK_API:
         headers: dict = None,
         params: dict = None,
         data: dict = None,
-        auth: str = None,
+        auth: aiohttp.BasicAuth = None,
         use_ssl: bool = True,
+        timeout: float = None,
     ) -> dict:
         """
-        A wrapper for requests lib to send our requests and handle requests and responses better.
+        A wrapper for aiohttp to send our requests and handle requests and responses better.
+        All requests go through the shared session, so connections are reused.
 
         :type method: ``str``
         :param method: HTTP method for the request.
@@ -81,39 +125,50 @@ class VK_API:
         :type data: ``str``
         :param data: The body data of the request.
 
-        :type auth: ``str``
+        :type auth: ``aiohttp.BasicAuth``
         :param auth: Basic HTTP authentication
 
+        :type use_ssl: ``bool``
+        :param use_ssl: Verify SSL certificate.
+
+        :type timeout: ``float``
+        :param timeout: Seconds for the whole request. VK_config.HTTP.total_timeout by default.
+
         :return: Returns the http request response json
         :rtype: ``dict``
         """
 
         await self.reset_result()
-        vk_api_log.debug("============== Do request ================")
-        vk_api_log.debug(f"# Requesting for: {url}")
+        trace("============== Do request ================")
+        trace("# Requesting for: {}", url)
+        session = await get_session()
+        # Session timeouts are used unless the request has its own, like longpoll waiting for events
+        options = {}
+        if timeout:
+            options["timeout"] = aiohttp.ClientTimeout(total=timeout, connect=VK_config.HTTP.connect_timeout)
         try:
-            response = requests.request(
+            async with session.request(
                 method,
                 url,
-                verify=bool(use_ssl),
+                ssl=bool(use_ssl),
                 headers=headers,
                 params=params,
                 auth=auth,
                 data=data,
-            )
+                **options,
+            ) as response:
+                trace("# Request result: {}", response.status)
+                text = await response.text(encoding="utf-8")
         except (
-            requests.ConnectionError,
-            requests.HTTPError,
-            requests.Timeout,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
         ) as e:
-            msg = f"Error occure during the request: {str(e)}"
+            msg = f"Error occure during the request: {str(e) or type(e).__name__}"
             vk_api_log.error(msg)
             return msg
         try:
-            # response.encoding('utf-8')
-            vk_api_log.debug(f"# Request result: {response}")
-            res = json.loads(response.text)
-            vk_api_log.debug(f"# Response text: {res}")
+            res = json.loads(text)
+            trace("# Response text: {}", res)
             if "error" in res.keys():
                 msg = (
                     f"[VK ERROR] Response: error code - {res['error']['error_code']}, "
@@ -132,7 +187,7 @@ class VK_API:
         VK API class method to reset request results.
         """
 
-        vk_api_log.debug("# Reset result")
+        trace("# Reset result")
         self.result = {"text": "", "error": 0}
 
     @vk_api_log.catch
@@ -150,7 +205,7 @@ class VK_API:
         :rtype: ``dict``
         """
 
-        vk_api_log.debug("============== Process response ================")
+        trace("============== Process response ================")
         if "error" in response.keys():
             msg = (
                 f"[VK ERROR] Response: error code - {response['error']['error_code']}, "
@@ -163,5 +218,5 @@ class VK_API:
 
         self.result["text"] = message
         self.result["error"] = 0
-        vk_api_log.debug(f"# {self.result}")
+        trace("# {}", self.result)
         return self.result
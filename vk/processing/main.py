@@ -2,7 +2,6 @@
 # Reviewed: July 25, 2025
 from __future__ import annotations
 
-from time import sleep
 from typing import Optional, Dict
 
 from loguru import logger
@@ -10,13 +9,54 @@ from loguru import logger as vk_proc_log
 
 from config.vk import VK_config
 from config.logs import Logs
-from filter import Filter
+from filter import Filter, NormalizedText
 from vk.api.groups import Groups
 from vk.api.messages import Messages
 from vk.api.users import Users
+from vk.processing.recheck import Recheck, RecheckScheduler
+from tracing import get_tracer
+
+trace = get_tracer("vk_processing")
+
+# Most messages messages.search returns at once
+SEARCH_COUNT_LIMIT = 100
+
+
+def update_chain(update: dict) -> tuple:
+    """
+    Key of the updates which must be processed in order: messages of one chat, comments of one post or photo.
+    Updates with different keys are independent.
+
+    :type update: ``dict``
+    :param update: VK LongPoll update.
+
+    :return: Returns the key.
+    :rtype: ``tuple``
+    """
+
+    update_object = update.get("object", {})
+    message = update_object.get("message", update_object)
+    if "peer_id" in message:
+        return ("peer", message["peer_id"])
+    if "post_id" in update_object:
+        return ("post", update_object.get("post_owner_id", update_object.get("owner_id")), update_object["post_id"])
+    if "photo_id" in update_object:
+        return ("photo", update_object.get("photo_owner_id"), update_object["photo_id"])
+    return ("update", id(update))
 
 
 class VK_processing:
+    # VK LongPoll update types and methods processing them
+    # https://dev.vk.com/ru/api/community-events/json-schema
+    update_handlers: dict[str, str] = {
+        "message_new": "message",
+        "message_edit": "message_edit",
+        "wall_reply_new": "comment",
+        "wall_reply_edit": "comment",
+        "photo_comment_new": "comment",
+        "photo_comment_edit": "comment",
+    }
+
     # To avoid async __init__
     @classmethod
     async def create(
@@ -24,6 +64,11 @@ class VK_processing:
         vk_proc_log: logger = vk_proc_log,  # type: ignore
         debug_enabled: bool = False,
         send_msg_to_vk: bool = False,
+        filter_instance: Filter | None = None,
+        vk_groups: Groups | None = None,
+        vk_messages: Messages | None = None,
+        vk_users: Users | None = None,
+        rechecks_enabled: bool = True,
     ) -> None:
         """
         VK Processing class init
@@ -34,6 +79,24 @@ class VK_processing:
         :type debug_enabled: ``bool``
         :param debug_enabled: Boolean to switch on and off debugging. False by default.
 
+        :type send_msg_to_vk: ``bool``
+        :param send_msg_to_vk: Send notifications to VK chat. False by default.
+
+        :type filter_instance: ``Filter | None``
+        :param filter_instance: Filter to check with. New one is created by default.
+
+        :type vk_groups: ``Groups | None``
+        :param vk_groups: VK API groups instance. New one is created by default.
+
+        :type vk_messages: ``Messages | None``
+        :param vk_messages: VK API messages instance. New one is created by default.
+
+        :type vk_users: ``Users | None``
+        :param vk_users: VK API users instance. New one is created by default.
+
+        :type rechecks_enabled: ``bool``
+        :param rechecks_enabled: Recheck chat messages after bad bots have had time to edit them. True by default.
+
         :return: Returns the class instance.
         """
 
@@ -59,10 +122,20 @@ class VK_processing:
             self.vk_proc_log = vk_proc_log
 
         # Necessary instances
-        self.filter = await Filter.create(debug_enabled=debug_enabled)
-        self.vk_groups = await Groups.create()
-        self.vk_messages = await Messages.create()
-        self.vk_users = await Users.create()
+        self.filter = filter_instance if filter_instance is not None else await Filter.create(debug_enabled=debug_enabled)
+        self.vk_groups = vk_groups if vk_groups is not None else await Groups.create()
+        self.vk_messages = vk_messages if vk_messages is not None else await Messages.create()
+        self.vk_users = vk_users if vk_users is not None else await Users.create()
+        self.rechecks = None
+        if rechecks_enabled:
+            self.rechecks = RecheckScheduler(
+                self.recheck,
+                delay=VK_config.check_delay,
+                limit=VK_config.recheck_limit,
+                concurrency=VK_config.recheck_concurrency,
+                window=VK_config.recheck_window,
+                recheck_log=self.vk_proc_log,
+            )
 
         # Internal variables and options
         # Result = 0 - false
@@ -70,24 +143,10 @@ class VK_processing:
         # Result = 2 - suspicious
         self.result = {"result": 0, "text": "", "case": ""}
         self.send_msg_to_vk = send_msg_to_vk
+        # Last conversation message ID seen in every chat
+        self.last_cm_ids: dict[int, int] = {}
         return self
 
-    @vk_proc_log.catch
-    async def replacements(self, text: str) -> str:
-        """
-        Processing class method to replace unwanted symbols in provided text.
-        Replaced symbols: ё -> е, \n -> ' '
-
-        :type text_to_check: ``str``
-        :param text_to_check: Text to check.
-
-        :return: Returns the text with replacements.
-        :rtype: ``str``
-        """
-
-        replaced = text.replace("\n", " ").replace("ё", "е").lower()
-        return replaced
-
     @vk_proc_log.catch
     async def get_username(self, user_id: int) -> str:
         """
@@ -108,7 +167,7 @@ class VK_processing:
     @vk_proc_log.catch
     async def filter_response_processing(
         self,
-        message: str,
+        message: NormalizedText,
         username: str,
         group_id: int,
         is_member: bool,
@@ -116,13 +175,14 @@ class VK_processing:
         cm_id: Optional[int] = None,
         attachments: Optional[Dict] = None,
         false_positive: bool = False,
+        user_id: Optional[int] = None,
     ) -> None:
         """
         Processing class method to work with filter response.
         I'm suppose to use this method for comments in future, so it's the dedicated function.
 
-        :type message: ``str``
-        :param message: Text of message/comment.
+        :type message: ``NormalizedText``
+        :param message: Text of message/comment, normalized once per message.
 
         :type username: ``str``
         :param username: Username as text.
@@ -141,6 +201,12 @@ class VK_processing:
 
         :type attachments: ``Optional[Dict]``
         :param attachments: Message attachments, if they are.
+
+        :type false_positive: ``bool``
+        :param false_positive: Is it the second check of the message.
+
+        :type user_id: ``Optional[int]``
+        :param user_id: User ID for mass mailing check. Second check of the message passes None.
         """
 
         filter_result = await self.filter.filter_response(
@@ -148,10 +214,11 @@ class VK_processing:
             username,
             attachments,
             is_member,
+            user_id,
         )
-        vk_proc_log.debug("============== Filter response processing =================")
-        vk_proc_log.debug(f"# False positive: {false_positive}")
-        vk_proc_log.debug(f"# Filter result: {filter_result}")
+        trace("============== Filter response processing =================")
+        trace("# False positive: {}", false_positive)
+        trace("# Filter result: {}", filter_result)
 
         # Exit if None
         if filter_result is None:
@@ -161,57 +228,37 @@ class VK_processing:
         # Reason: there is no more ID for messages in public chat and we can't
         #    know if message was edited. So we wait for bad bot to edit message and then
         #    through VK API search messages get possibly redacted message and check it once again.
+        # Recheck is scheduled in the background, so processing of other updates goes on.
         # Additional condition is for Message type of the update
-        if filter_result["result"] in [0, 2] and not false_positive and cm_id is not None:
-            vk_proc_log.debug(f"# This was clear message, we'll wait for {VK_config.check_delay} seconds and check it once more.")
-            sleep(VK_config.check_delay)
-            vk_proc_log.debug(f"Group ID: {group_id}, Peer ID: {peer_id}")
-            last_reply = await self.vk_messages.search(
-                group_id,
-                peer_id,
-                VK_config.messages_search_count,
-            )
-            last_reply = last_reply["text"]
-            vk_proc_log.debug(f"# Last reply: {last_reply}")
-            if last_reply["items"] != []:
-                await self.filter_response_processing(
-                    last_reply["items"][0]["text"],
-                    await self.get_username(
-                        user_id=last_reply["items"][0]["from_id"]
-                    ),
-                    group_id,
-                    is_member,
-                    last_reply["items"][0]["peer_id"],
-                    last_reply["items"][0]["conversation_message_id"],
-                    last_reply["items"][0]["attachments"],
-                    false_positive=True,
-                )
+        if filter_result.result in [0, 2] and not false_positive and cm_id is not None and self.rechecks is not None:
+            trace("# This was clear message, we'll check it once more in {} seconds.", VK_config.check_delay)
+            self.rechecks.schedule(Recheck(group_id, peer_id, cm_id, is_member))
 
         # If filter returns 1 - we catch something
-        if filter_result["result"] == 1:
+        if filter_result.result == 1:
             # Compose message for notification
             div = "-----------------------------"
             # update_type = "Message"
             # if cm_id is not None:
             #     update_type = "Comment"
-            msg_main = f"# Message to remove from {username}:\n# '{message.replace('.', '[.]').replace(':', '[:]')}'."
-            words = filter_result["text"]
-            case = f"# Case: {filter_result['case']}"
+            msg_main = f"# Message to remove from {username}:\n# '{message.raw.replace('.', '[.]').replace(':', '[:]')}'."
+            words = filter_result.text
+            case = f"# Case: {filter_result.case_description}"
             msg = f"{msg_main}\n{div}\n# {words}\n{div}\n{case}"
             vk_proc_log.info(msg)
             # Message remove
             if cm_id is not None:
-                vk_proc_log.debug(f"# Group ID: {group_id}, CM ID: {cm_id}, Peer ID: {peer_id}")
+                trace("# Group ID: {}, CM ID: {}, Peer ID: {}", group_id, cm_id, peer_id)
 
                 delete_result = await self.vk_messages.delete(
                     group_id, cm_id, peer_id
                 )
-                vk_proc_log.debug(f"# Delete result: {delete_result['text']}")
+                trace("# Delete result: {}", delete_result['text'])
                 if delete_result["error"] == 0:
                     vk_proc_log.info("# Message was removed")
                     if self.send_msg_to_vk:
                         send_result = await self.vk_messages.send(
-                            f"Сообщение от {username} было удалено автоматическим фильтром. Причина: {filter_result['case']}",
+                            f"Сообщение от {username} было удалено автоматическим фильтром. Причина: {filter_result.case_description}",
                             group_id,
                             peer_id,
                         )
@@ -234,16 +281,74 @@ class VK_processing:
                     )
 
         # If filter returns 2 - we should get warning to Telegram
-        if filter_result["result"] == 2:
+        if filter_result.result == 2:
             div = "-----------------------------"
-            msg_main = f"# Suspicious message from {username}:\n# '{message.replace('.', '[.]').replace(':', '[:]')}'"
-            words = filter_result["text"]
-            case = f"# Case: {filter_result['case']}"
+            msg_main = f"# Suspicious message from {username}:\n# '{message.raw.replace('.', '[.]').replace(':', '[:]')}'"
+            words = filter_result.text
+            case = f"# Case: {filter_result.case_description}"
             # This was made for avoid mess in msg var
             msg = f"{msg_main}\n{div}\n# {words}\n{div}\n{case}"
             vk_proc_log.info(msg)
             if self.send_msg_to_vk:
-                vk_proc_log.info(f"# Text: {filter_result['text']}.")
+                vk_proc_log.info(f"# Text: {filter_result.text}.")
+
+    @vk_proc_log.catch
+    async def process_chain(self, chain: list[tuple[str, dict]]) -> None:
+        """
+        Processing class method to process dependent updates one by one.
+
+        :type chain: ``list[tuple[str, dict]]``
+        :param chain: Handler method name and update.
+        """
+
+        for handler, update in chain:
+            await getattr(self, handler)(response={"updates": [update]})
+
+    @vk_proc_log.catch
+    async def recheck(self, rechecks: list[Recheck]) -> None:
+        """
+        Processing class method to check chat messages once more.
+        Called by the recheck scheduler with the messages of one chat, they are found by one search.
+
+        :type rechecks: ``list[Recheck]``
+        :param rechecks: Messages of one chat to recheck.
+        """
+
+        group_id = rechecks[0].group_id
+        peer_id = rechecks[0].peer_id
+        # Conversation message IDs go one by one in the chat, so the search covers messages from the oldest
+        # rechecked one to the last one seen, plus messages_search_count sent after it
+        cm_ids = [recheck.cm_id for recheck in rechecks]
+        last_cm_id = max(self.last_cm_ids.get(peer_id, 0), max(cm_ids))
+        count = min(last_cm_id - min(cm_ids) + 1 + VK_config.messages_search_count, SEARCH_COUNT_LIMIT)
+        trace("Group ID: {}, Peer ID: {}, messages to recheck: {}, search count: {}", group_id, peer_id, len(rechecks), count)
+        last_replies = await self.vk_messages.search(group_id, peer_id, count)
+        if not last_replies or last_replies["error"] != 0:
+            vk_proc_log.error(f"# Can't search messages of {peer_id} to recheck them")
+            return
+        items = {item["conversation_message_id"]: item for item in last_replies["text"]["items"]}
+        trace("# Found {} of {} messages to recheck", sum(cm_id in items for cm_id in cm_ids), len(cm_ids))
+        for recheck in rechecks:
+            item = items.get(recheck.cm_id)
+            # Message may be removed already
+            if item is None:
+                continue
+            await self.filter_response_processing(
+                NormalizedText.from_text(item["text"]),
+                await self.get_username(user_id=item["from_id"]),
+                group_id,
+                recheck.is_member,
+                item["peer_id"],
+                item["conversation_message_id"],
+                item["attachments"],
+                false_positive=True,
+            )
+
+    async def close(self) -> None:
+        """Processing class method to stop pending rechecks and close the Filter."""
+        if self.rechecks is not None:
+            await self.rechecks.close()
+        await self.filter.close()
 
     @vk_proc_log.catch
     async def message(self, response: dict) -> None:
@@ -254,16 +359,53 @@ class VK_processing:
         :param response: VK LongPoll response.
         """
 
-        vk_proc_log.debug("# Processing message")
-        message = await self.replacements(response["updates"][0]["object"]["message"]["text"])
-        attachments = response["updates"][0]["object"]["message"]["attachments"]
-        user_id = response["updates"][0]["object"]["message"]["from_id"]
-        group_id = response["updates"][0]["group_id"]
-        peer_id = response["updates"][0]["object"]["message"]["peer_id"]
-        cm_id = response["updates"][0]["object"]["message"]["conversation_message_id"]
+        trace("# Processing message")
+        await self.process_message(
+            response["updates"][0]["object"]["message"],
+            response["updates"][0]["group_id"],
+        )
+
+    @vk_proc_log.catch
+    async def message_edit(self, response: dict) -> None:
+        """
+        Processing class method to process edited VK message.
+        Edited message is checked as the second check: bad bots edit messages after the first one.
+
+        :type response: ``dict``
+        :param response: VK LongPoll response.
+        """
+
+        trace("# Processing edited message")
+        await self.process_message(
+            response["updates"][0]["object"],
+            response["updates"][0]["group_id"],
+            edited=True,
+        )
+
+    @vk_proc_log.catch
+    async def process_message(self, message_object: dict, group_id: int, edited: bool = False) -> None:
+        """
+        Processing class method to check VK message.
+
+        :type message_object: ``dict``
+        :param message_object: VK message object.
+
+        :type group_id: ``int``
+        :param group_id: Group ID.
+
+        :type edited: ``bool``
+        :param edited: Is it the edited message.
+        """
+
+        message = NormalizedText.from_text(message_object["text"])
+        attachments = message_object["attachments"]
+        user_id = message_object["from_id"]
+        peer_id = message_object["peer_id"]
+        cm_id = message_object["conversation_message_id"]
+        self.last_cm_ids[peer_id] = max(self.last_cm_ids.get(peer_id, 0), cm_id)
         username = await self.get_username(user_id)
         # Check if user is in Group. If not - it's suspicious
-        vk_proc_log.debug("# Checking if User is in Group")
+        trace("# Checking if User is in Group")
         is_member = True
         is_memberRes = await self.vk_groups.is_member(
             user_id=user_id,
@@ -275,15 +417,15 @@ class VK_processing:
                 is_member = False
 
         # Kick user notification
-        if message == "" and attachments == "":
+        if not message and attachments == "":
             try:
-                action_type = response["updates"][0]["object"]["message"]["action"]["type"]
+                action_type = message_object["action"]["type"]
             except Exception:
                 vk_proc_log.error("# Can't get Action Type from the response")
                 raise
             if action_type != "":
                 if action_type == "chat_kick_user":
-                    kicked_user_id = response["updates"][0]["object"]["message"]["action"]["member_id"]
+                    kicked_user_id = message_object["action"]["member_id"]
                     kicked_username = await self.vk_users.get(kicked_user_id)
                     if kicked_username["error"] == 1:
                         vk_proc_log.error(f"# Can't get username from ID: {kicked_username['text']}")
@@ -293,7 +435,7 @@ class VK_processing:
                         vk_proc_log.info(msg)
 
         # If all is OK - start checking message
-        vk_proc_log.debug(f"# New message: {message}; User: {username}")
+        trace("# New message: {}; User: {}", message, username)
         await self.filter_response_processing(
             message=message,
             username=username,
@@ -302,6 +444,9 @@ class VK_processing:
             cm_id=cm_id,
             attachments=attachments,
             is_member=is_member,
+            # Edited message was counted for mass mailing when it was new
+            false_positive=edited,
+            user_id=None if edited else user_id,
         )
 
         # # Tests section # #
@@ -318,19 +463,19 @@ class VK_processing:
         :param response: VK LongPoll response.
         """
 
-        vk_proc_log.debug("# Processing comment")
-        message = await self.replacements(response["updates"][0]["object"]["text"])
+        trace("# Processing comment")
+        message = NormalizedText.from_text(response["updates"][0]["object"]["text"])
         user_id = response["updates"][0]["object"]["from_id"]
         username = await self.get_username(user_id)
 
-        vk_proc_log.debug(f"# New/edited comment: {message}; User: {username}")
-        filter_result = await self.filter.filter_response(message, username, [], True)
-        vk_proc_log.debug(f"# Filter result: {filter_result}")
-        if filter_result["result"] == 1:
+        trace("# New/edited comment: {}; User: {}", message, username)
+        filter_result = await self.filter.filter_response(message, username, [], True, user_id)
+        trace("# Filter result: {}", filter_result)
+        if filter_result.result == 1:
             # Compose message for notification
             div = "-----------------------------"
-            msg_main = f"# Comment to remove from {username}:\n# '{message.replace('.', '[.]').replace(':', '[:]')}'."
-            words = filter_result["text"]
-            case = f"# Case: {filter_result['case']}"
+            msg_main = f"# Comment to remove from {username}:\n# '{message.raw.replace('.', '[.]').replace(':', '[:]')}'."
+            words = filter_result.text
+            case = f"# Case: {filter_result.case_description}"
             msg = f"{msg_main}\n{div}\n# {words}\n{div}\n{case}"
             vk_proc_log.info(msg)
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from loguru import logger
+
+from config.vk import VK_config
+from vk.processing.main import update_chain
+from tracing import get_tracer
+
+trace = get_tracer("vk_processing")
+
+
+@dataclass(slots=True)
+class PipelineMetrics:
+    """
+    Counters of the longpoll pipeline.
+
+    batches, fetched - longpoll responses with updates and their updates;
+    skipped - updates without handler;
+    processed - updates processed by consumers;
+    fetch_errors - longpoll responses with errors;
+    blocked_puts - updates which waited for a free place in the full queue, and put_wait the seconds they waited;
+    max_depth - the largest count of updates in the queue;
+    queue_wait, max_queue_wait - seconds updates waited in the queue, all and the longest;
+    processing_time - seconds of processing.
+    """
+
+    batches: int = 0
+    fetched: int = 0
+    skipped: int = 0
+    processed: int = 0
+    fetch_errors: int = 0
+    blocked_puts: int = 0
+    put_wait: float = 0.0
+    max_depth: int = 0
+    queue_wait: float = 0.0
+    max_queue_wait: float = 0.0
+    processing_time: float = 0.0
+
+
+class LongpollPipeline:
+    """
+    Longpoll fetching and update processing, decoupled by a bounded queue.
+
+    One task fetches longpoll responses and puts their updates into the queue, so the next
+    a_check is sent while the previous updates are processed. Consumer tasks take updates from
+    the queue. Updates of one chat, post or photo are processed in order: a consumer holds the lock
+    of the chain while processing, and locks wake waiters first come, first served.
+    Full queue stops fetching until consumers catch up, and the waits are counted in the metrics.
+    """
+
+    def __init__(
+        self,
+        longpoll: Any,
+        processing: Any,
+        queue_size: int = VK_config.Pipeline.queue_size,
+        consumers: int = VK_config.Pipeline.consumers,
+        pipeline_log: logger = logger,  # type: ignore
+    ) -> None:
+        """
+        Build the pipeline.
+
+        :type longpoll: ``Longpoll``
+        :param longpoll: Longpoll instance with server parameters.
+
+        :type processing: ``VK_processing``
+        :param processing: Processing instance.
+
+        :type queue_size: ``int``
+        :param queue_size: Updates waiting for processing.
+
+        :type consumers: ``int``
+        :param consumers: Tasks processing updates.
+
+        :type pipeline_log: ``logger``
+        :param pipeline_log: Logger instance.
+        """
+
+        self.longpoll = longpoll
+        self.processing = processing
+        self.queue: asyncio.Queue[tuple[str, dict, float]] = asyncio.Queue(maxsize=max(queue_size, 1))
+        self.consumers = max(consumers, 1)
+        self.pipeline_log = pipeline_log
+        self.metrics = PipelineMetrics()
+        self.started = time.time()
+        # Lock of every chain with updates in processing and count of consumers holding or waiting for it
+        self.chain_locks: dict[tuple, asyncio.Lock] = {}
+        self.chain_users: dict[tuple, int] = {}
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Copy of the metrics with the current queue depth.
+
+        :return: Returns the metrics.
+        :rtype: ``dict[str, Any]``
+        """
+
+        metrics = {
+            name: round(value, 3) if isinstance(value, float) else value
+            for name, value in asdict(self.metrics).items()
+        }
+        metrics["queue_depth"] = self.queue.qsize()
+        metrics["queue_size"] = self.queue.maxsize
+        metrics["chains_in_processing"] = len(self.chain_locks)
+        metrics["uptime"] = round(time.time() - self.started, 1)
+        return metrics
+
+    async def put(self, handler: str, update: dict) -> None:
+        """Put the update into the queue, counting the wait if the queue is full."""
+        item = (handler, update, time.perf_counter())
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            started = time.perf_counter()
+            await self.queue.put(item)
+            self.metrics.blocked_puts += 1
+            self.metrics.put_wait += time.perf_counter() - started
+        self.metrics.max_depth = max(self.metrics.max_depth, self.queue.qsize())
+
+    async def fetch(self) -> None:
+        """
+        Listen to the longpoll server and put updates into the queue.
+        Returns when the errors limit is over, as the bot did before.
+        """
+
+        errors = 0
+        while True:
+            # Listening
+            longpoll_result = await self.longpoll.process_longpoll_response()
+            if not longpoll_result or longpoll_result["type"] in ("", "pass"):
+                continue
+            if longpoll_result["type"] == "error":
+                errors += 1
+                self.metrics.fetch_errors += 1
+                await asyncio.sleep(VK_config.Longpoll.wait_period)
+                if errors >= VK_config.Longpoll.errors_limit:
+                    self.pipeline_log.error("# Errors limit is over. Shutting down.")
+                    return
+                continue
+            updates = longpoll_result["text"]
+            self.metrics.batches += 1
+            self.metrics.fetched += len(updates)
+            for update in updates:
+                handler = self.processing.update_handlers.get(update.get("type"))
+                if handler is None:
+                    trace("# Skipping update of type {}", update.get("type"))
+                    self.metrics.skipped += 1
+                    continue
+                await self.put(handler, update)
+            trace("# {} updates fetched, queue depth: {}", len(updates), self.queue.qsize())
+
+    async def consume(self) -> None:
+        """Process updates from the queue, until cancelled."""
+        while True:
+            handler, update, queued = await self.queue.get()
+            try:
+                await self.process(handler, update, queued)
+            finally:
+                self.queue.task_done()
+
+    async def process(self, handler: str, update: dict, queued: float) -> None:
+        """
+        Process the update after the previous updates of its chain.
+
+        :type handler: ``str``
+        :param handler: VK_processing method processing the update.
+
+        :type update: ``dict``
+        :param update: VK LongPoll update.
+
+        :type queued: ``float``
+        :param queued: perf_counter value when the update was put into the queue.
+        """
+
+        chain = update_chain(update)
+        lock = self.chain_locks.get(chain)
+        if lock is None:
+            lock = self.chain_locks[chain] = asyncio.Lock()
+        self.chain_users[chain] = self.chain_users.get(chain, 0) + 1
+        try:
+            async with lock:
+                started = time.perf_counter()
+                waited = started - queued
+                self.metrics.queue_wait += waited
+                self.metrics.max_queue_wait = max(self.metrics.max_queue_wait, waited)
+                await self.processing.process_chain([(handler, update)])
+                self.metrics.processing_time += time.perf_counter() - started
+                self.metrics.processed += 1
+        finally:
+            self.chain_users[chain] -= 1
+            if not self.chain_users[chain]:
+                del self.chain_users[chain]
+                del self.chain_locks[chain]
+
+    async def log_metrics_periodically(self, interval: float) -> None:
+        """Log the metrics every interval seconds, until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            self.pipeline_log.info(f"# Longpoll pipeline metrics: {self.snapshot()}")
+
+    async def run(self) -> None:
+        """
+        Run fetching and consumers. Returns when fetching stops,
+        after the updates already in the queue are processed.
+        """
+
+        consumers = [asyncio.create_task(self.consume()) for _ in range(self.consumers)]
+        metrics_task = None
+        if VK_config.Pipeline.metrics_interval > 0:
+            metrics_task = asyncio.create_task(self.log_metrics_periodically(VK_config.Pipeline.metrics_interval))
+        try:
+            await self.fetch()
+            await self.queue.join()
+        finally:
+            for task in consumers + [metrics_task]:
+                if task is not None:
+                    task.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+            self.pipeline_log.info(f"# Longpoll pipeline metrics: {self.snapshot()}")
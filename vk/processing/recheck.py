@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# Reviewed: October 17, 2026
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+from config.vk import VK_config
+from tracing import get_tracer
+
+trace = get_tracer("vk_processing")
+
+
+@dataclass(frozen=True, slots=True)
+class Recheck:
+    """
+    Second check of a chat message, after bad bots have had time to edit it.
+
+    group_id, peer_id, cm_id - the message;
+    is_member - is its sender member of the public.
+    """
+
+    group_id: int
+    peer_id: int
+    cm_id: int
+    is_member: bool = True
+
+
+class RecheckScheduler:
+    """
+    Delayed rechecks of chat messages, run in the background and coalesced by chat.
+
+    Rechecks of one chat scheduled within window seconds form a batch, so one search finds all of them.
+    Batches wait in a heap ordered by due time, and one task sleeps until the earliest of them
+    is due, so intake never waits for them. Every recheck of the batch waits at least delay seconds.
+    Due batches run as tasks, at most concurrency at once.
+    Rechecks waiting and running are limited: new rechecks over the limit are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list[Recheck]], Awaitable[Any]],
+        delay: float = VK_config.check_delay,
+        limit: int = VK_config.recheck_limit,
+        concurrency: int = VK_config.recheck_concurrency,
+        window: float = VK_config.recheck_window,
+        recheck_log: logger = logger,  # type: ignore
+    ) -> None:
+        """
+        Build the scheduler.
+
+        :type handler: ``Callable[[list[Recheck]], Awaitable[Any]]``
+        :param handler: Coroutine function running the rechecks of one chat.
+
+        :type delay: ``float``
+        :param delay: Seconds from scheduling to the recheck, at least.
+
+        :type limit: ``int``
+        :param limit: Rechecks waiting and running.
+
+        :type concurrency: ``int``
+        :param concurrency: Batches running at once.
+
+        :type window: ``float``
+        :param window: Seconds a batch of the chat takes new rechecks.
+
+        :type recheck_log: ``logger``
+        :param recheck_log: Logger instance.
+        """
+
+        self.handler = handler
+        self.delay = delay
+        self.limit = limit
+        self.window = window
+        self.recheck_log = recheck_log
+        self.heap: list[tuple[float, int, list[Recheck]]] = []
+        # Batch of every chat taking new rechecks, with the time it was opened
+        self.open_batches: dict[int, tuple[float, list[Recheck]]] = {}
+        self.sequence = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.semaphore = asyncio.Semaphore(max(concurrency, 1))
+        self.running: set[asyncio.Task] = set()
+        self.task: asyncio.Task | None = None
+        self.waiting = 0
+        self.in_progress = 0
+        self.scheduled = 0
+        self.done = 0
+        self.batches = 0
+        self.dropped = 0
+        self.full = False
+
+    @property
+    def pending(self) -> int:
+        """Rechecks waiting and running."""
+        return self.waiting + self.in_progress
+
+    def schedule(self, recheck: Recheck) -> bool:
+        """
+        Schedule the recheck with the batch of its chat. Starts the scheduler task on first use.
+
+        :type recheck: ``Recheck``
+        :param recheck: Recheck to run.
+
+        :return: Returns False if the recheck was dropped by the limit.
+        :rtype: ``bool``
+        """
+
+        if self.pending >= self.limit:
+            self.dropped += 1
+            if not self.full:
+                self.recheck_log.warning(
+                    f"# {self.pending} rechecks are pending, new messages are not rechecked until some are done."
+                )
+                self.full = True
+            return False
+        self.full = False
+        now = asyncio.get_running_loop().time()
+        self.scheduled += 1
+        self.waiting += 1
+        opened, batch = self.open_batches.get(recheck.peer_id, (0.0, None))
+        if batch is not None and now - opened <= self.window:
+            batch.append(recheck)
+            return True
+        batch = [recheck]
+        self.open_batches[recheck.peer_id] = (now, batch)
+        heapq.heappush(self.heap, (now + self.window + self.delay, next(self.sequence), batch))
+        if self.heap[0][2] is batch:
+            # Earlier than the one the scheduler sleeps for
+            self.wakeup.set()
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+        return True
+
+    async def run(self) -> None:
+        """Start batches when they are due, until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            self.wakeup.clear()
+            if not self.heap:
+                await self.wakeup.wait()
+                continue
+            delay = self.heap[0][0] - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.semaphore.acquire()
+            _, _, batch = heapq.heappop(self.heap)
+            peer_id = batch[0].peer_id
+            if self.open_batches.get(peer_id, (0.0, None))[1] is batch:
+                del self.open_batches[peer_id]
+            self.waiting -= len(batch)
+            self.in_progress += len(batch)
+            task = asyncio.create_task(self.execute(batch))
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+
+    async def execute(self, batch: list[Recheck]) -> None:
+        """Run the rechecks of the chat and free their places."""
+        try:
+            trace("# Recheck of {} messages in {}", len(batch), batch[0].peer_id)
+            await self.handler(batch)
+        except Exception as error:
+            self.recheck_log.error(f"# Recheck of {len(batch)} messages in {batch[0].peer_id} failed: {error}")
+        finally:
+            self.in_progress -= len(batch)
+            self.done += len(batch)
+            self.batches += 1
+            self.semaphore.release()
+
+    def snapshot(self) -> dict[str, int]:
+        """Counters of the scheduler."""
+        return {
+            "scheduled": self.scheduled,
+            "done": self.done,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "waiting": self.waiting,
+            "running": self.in_progress,
+        }
+
+    async def close(self) -> None:
+        """Stop the scheduler and running rechecks. Waiting rechecks are dropped."""
+        tasks = list(self.running)
+        if self.task is not None:
+            tasks.append(self.task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.task = None
+        self.heap = []
+        self.open_batches = {}
+        self.waiting = 0
@@ -10,8 +10,11 @@ from notifiers.logging import NotificationHandler
 
 from config.vk import VK_config
 from config.tlg import Telegram
+from vk.api import close_session
 from vk.api.longpoll import Longpoll
 from vk.processing import VK_processing
+from vk.processing.pipeline import LongpollPipeline
+import tracing
 
 
 @logger.catch
@@ -74,6 +77,7 @@ async def main() -> None:
             retention=2,
         )
     main_log = logger.bind(name="main_log")
+    tracing.configure(args.debug_enabled)
 
     # Telegram messages logging
     if args.send_msg_to_tlg:
@@ -87,37 +91,27 @@ async def main() -> None:
     main_log.info("# VK Moderator bot is (re)starting...")
 
     # # # # Start VK longpoll # # # #
-    vk_longpoll = await Longpoll.create()
-    proc = await VK_processing.create(
-        debug_enabled=args.debug_enabled,
-        send_msg_to_vk=args.send_msg_to_vk,
-    )
+    proc = None
+    try:
+        vk_longpoll = await Longpoll.create()
+        proc = await VK_processing.create(
+            debug_enabled=args.debug_enabled,
+            send_msg_to_vk=args.send_msg_to_vk,
+        )
 
-    if vk_longpoll and proc:
-        errors_limit = VK_config.Longpoll.errors_limit
-        errors = 0
-        while True:
-            # Listening
-            longpoll_result = await vk_longpoll.process_longpoll_response()
-            if longpoll_result:
-                if longpoll_result["type"] != "":
-                    response_type = longpoll_result["type"]
-                    # Response type, like 'message' or 'comment' will call
-                    # according function from Processing. Error will be processed.
-                    if not response_type == "error" and not response_type == "pass":
-                        function_to_call = getattr(proc, response_type)
-                        await function_to_call(response=longpoll_result["text"])
-                    elif response_type == "error":
-                        errors += 1
-                        await asyncio.sleep(VK_config.Longpoll.wait_period)
-                        if errors >= errors_limit:
-                            main_log.error("# Errors limit is over. Shutting down.")
-                            return None
-                    elif response_type == "pass":
-                        pass
-    else:
-        main_log.error("# Cannot start VK Longpoll or Processing. Shutting down.")
-        return None
+        if vk_longpoll and proc:
+            # Longpoll is listened by one task while others process updates
+            pipeline = LongpollPipeline(vk_longpoll, proc, pipeline_log=main_log)
+            await pipeline.run()
+            return None
+        else:
+            main_log.error("# Cannot start VK Longpoll or Processing. Shutting down.")
+            return None
+    finally:
+        # Pending rechecks are stopped and connections of the shared HTTP session are closed on shutdown
+        if proc:
+            await proc.close()
+        await close_session()
 
 
 if __name__ == "__main__":